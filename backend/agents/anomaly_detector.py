@@ -7,6 +7,7 @@ A property with Z > 1.5 is assessed significantly above its neighbors,
 providing a strong §41.43(b)(1) equity uniformity argument.
 """
 
+import asyncio
 import logging
 import numpy as np
 from typing import Dict, List, Optional
@@ -131,7 +132,7 @@ class AnomalyDetectorAgent:
 
         # Look up property details if needed
         if not neighborhood_code:
-            prop = await self.db.get_property_by_account(account_number)
+            prop = await self.db.get_property_by_account(account_number, fields="neighborhood_code, district")
             if not prop:
                 logger.warning(f"AnomalyDetector: Property {account_number} not found in DB")
                 return None
@@ -161,7 +162,7 @@ class AnomalyDetectorAgent:
         if not self.db.client:
             return []
         try:
-            response = (
+            query = (
                 self.db.client.table("properties")
                 .select("account_number,address,appraised_value,building_area,year_built,neighborhood_code")
                 .eq("neighborhood_code", neighborhood_code)
@@ -169,8 +170,9 @@ class AnomalyDetectorAgent:
                 .gt("building_area", 0)
                 .gt("appraised_value", 0)
                 .limit(limit)
-                .execute()
             )
+            # supabase-py is synchronous — keep the round-trip off the event loop
+            response = await asyncio.to_thread(query.execute)
             return response.data or []
         except Exception as e:
             logger.error(f"AnomalyDetector: DB query failed for neighborhood {neighborhood_code}: {e}")
@@ -21,6 +21,9 @@ class AppraisalDistrictConnector(ABC):
         district: str  (e.g. "HCAD", "TAD", "DCAD", "TCAD", "CCAD")
     """
 
+    # Neighbor deep-scrapes the protest pipeline may run against this source at once
+    MAX_CONCURRENCY = 6
+
     # Commercial neighborhood code keywords — skip neighborhood-wide search for these
     COMMERCIAL_KEYWORDS = [
         "general", "commercial", "industrial", "service", "office",
@@ -29,13 +32,17 @@ class AppraisalDistrictConnector(ABC):
     ]
 
     @abstractmethod
-    async def get_property_details(self, account_number: str, address: Optional[str] = None) -> Optional[Dict]:
+    async def get_property_details(self, account_number: str, address: Optional[str] = None,
+                                   cached_record: Optional[Dict] = None) -> Optional[Dict]:
         """
         Fetches property details from the district's data source.
         
         Args:
             account_number: The unique account/parcel ID.
             address: Optional address to fallback or verify.
+            cached_record: The caller's already-fetched `properties` row for this
+                account ({} if it looked and found none). Connectors with a
+                Supabase-first step use it instead of querying again.
             
         Returns:
             Dict containing standardized property details, or None if not found.
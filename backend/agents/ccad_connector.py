@@ -15,11 +15,13 @@ class CCADConnector(AppraisalDistrictConnector):
     # 2025 Dataset ID: vffy-snc6
     DATASET_ID = "vffy-snc6" 
     BASE_URL = "https://data.texas.gov/resource"
+    MAX_CONCURRENCY = 12  # Socrata JSON API, no browser behind it
 
     def __init__(self):
         self.client = httpx.AsyncClient(timeout=30.0)
 
-    async def get_property_details(self, account_number: str, address: Optional[str] = None) -> Optional[Dict]:
+    async def get_property_details(self, account_number: str, address: Optional[str] = None,
+                                   cached_record: Optional[Dict] = None) -> Optional[Dict]:
         logger.info(f"CCAD Lookup: {account_number}")
         
         # Detect address-as-account: if the "account number" contains spaces and
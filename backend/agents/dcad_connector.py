@@ -2,8 +2,8 @@ import asyncio
 import logging
 import re
 from typing import Dict, List, Optional
-from playwright.async_api import async_playwright
 from .base_connector import AppraisalDistrictConnector
+from .hcad_scraper import shared_browser_lease
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +18,8 @@ class DCADConnector(AppraisalDistrictConnector):
         self.base_url = "https://www.dallascad.org"
         self.search_url = f"{self.base_url}/SearchAcct.aspx"
 
-    async def get_property_details(self, account_number: str, address: Optional[str] = None) -> Dict:
+    async def get_property_details(self, account_number: str, address: Optional[str] = None,
+                                   cached_record: Optional[Dict] = None) -> Dict:
         """
         Scrapes property details from DCAD given an account number.
         Step 0: Check Supabase bulk-data first — instant lookup, no browser needed.
@@ -27,7 +28,7 @@ class DCADConnector(AppraisalDistrictConnector):
         # 0. Supabase cache-first lookup
         try:
             from backend.db.supabase_client import supabase_service
-            cached = await supabase_service.get_property_by_account(account_number)
+            cached = cached_record if cached_record is not None else await supabase_service.get_property_by_account(account_number)
             if cached and cached.get('address') and cached.get('district') == 'DCAD':
                 logger.info(f"DCAD: Returning cached record for {account_number} (no scraping needed).")
                 return cached
@@ -35,8 +36,7 @@ class DCADConnector(AppraisalDistrictConnector):
             logger.warning(f"DCAD: Supabase cache lookup failed: {e}")
 
         # 1. Playwright scraping fallback
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
+        async with shared_browser_lease() as browser:
             context = await browser.new_context(
                 user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
             )
@@ -207,8 +207,7 @@ class DCADConnector(AppraisalDistrictConnector):
         DCAD street search returns a list of neighbors.
         Uses smart polling instead of fixed sleeps.
         """
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
+        async with shared_browser_lease() as browser:
             page = await browser.new_page()
             neighbors = []
             try:
@@ -289,8 +288,7 @@ class DCADConnector(AppraisalDistrictConnector):
             logger.warning(f"DCAD: Supabase neighbor lookup failed: {e}")
 
         logger.info(f"DCAD: Searching for neighborhood code: {neighborhood_code}")
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
+        async with shared_browser_lease() as browser:
             page = await browser.new_page()
             neighbors = []
             try:
@@ -349,13 +347,10 @@ class DCADConnector(AppraisalDistrictConnector):
                 await browser.close()
 
     async def check_service_status(self) -> bool:
-        async with async_playwright() as p:
-            try:
-                browser = await p.chromium.launch(headless=True)
+        try:
+            async with shared_browser_lease() as browser:
                 page = await browser.new_page()
                 response = await page.goto(self.base_url, timeout=30000)
-                status = response.ok
-                await browser.close()
-                return status
-            except:
-                return False
+                return response.ok
+        except:
+            return False
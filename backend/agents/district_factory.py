@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Optional
 from .base_connector import AppraisalDistrictConnector
 from .hcad_scraper import HCADScraper
@@ -19,6 +20,7 @@ class DistrictConnectorFactory:
     """
     
     @staticmethod
+    @lru_cache(maxsize=8192)
     def detect_district_from_account(account_number: str) -> Optional[str]:
         """
         Analyzes account number format to guess the district.
@@ -3,6 +3,7 @@ import logging
 from backend.agents.sales_agent import SalesAgent
 from backend.services.valuation_service import valuation_service
 from backend.services.adjustment_model import adjustment_model
+from backend.utils.address_utils import ADDR_PUNCT_TABLE
 
 logger = logging.getLogger(__name__)
 
@@ -390,7 +391,7 @@ class EquityAgent:
                     try:
                         # Extract street portion for matching
                         street_part = comp_address.split(",")[0].strip()
-                        clean_street = "".join(c for c in street_part if c.isalnum() or c.isspace()).strip()
+                        clean_street = street_part.translate(ADDR_PUNCT_TABLE).strip()
                         
                         if len(clean_street) >= 4:
                             response = supabase_service.client.table("properties") \
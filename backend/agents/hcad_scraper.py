@@ -1,6 +1,7 @@
 import logging
 import asyncio
 import sys
+from contextlib import asynccontextmanager
 from typing import Optional, Dict, List
 from playwright.async_api import async_playwright
 import re
@@ -42,6 +43,91 @@ async def _launch_browser(p):
         kwargs['handle_sigint'] = False
     return await p.chromium.launch(**kwargs)
 
+
+# One Chromium per event loop, shared by every HCADScraper (and, through shared_browser_lease,
+# the TAD/DCAD/TCAD connectors). Launching costs 1-3s;
+# a fresh context per scrape is cheap and keeps cookies/storage isolated.
+_shared_playwright = None
+_shared_browser = None
+_shared_loop = None
+_shared_lock: Optional[asyncio.Lock] = None
+
+
+async def _get_shared_browser():
+    """Return the process-wide browser, launching (or relaunching) it on demand."""
+    global _shared_playwright, _shared_browser, _shared_loop, _shared_lock
+    loop = asyncio.get_running_loop()
+    if _shared_loop is not loop:
+        # Scripts call asyncio.run() repeatedly — a browser bound to a dead loop is unusable
+        _shared_playwright = _shared_browser = None
+        _shared_lock = asyncio.Lock()
+        _shared_loop = loop
+    async with _shared_lock:
+        if _shared_browser is None or not _shared_browser.is_connected():
+            if _shared_playwright is None:
+                _shared_playwright = await async_playwright().start()
+            _shared_browser = await _launch_browser(_shared_playwright)
+            logger.info("HCAD: Launched shared Chromium instance.")
+        return _shared_browser
+
+
+@asynccontextmanager
+async def _shared_browser_session():
+    """Yield the shared browser. Callers open (and close) their own context on it."""
+    yield await _get_shared_browser()
+
+
+class _BrowserLease:
+    """
+    Browser-shaped handle on the shared Chromium for the other district connectors.
+    new_context/new_page open contexts as usual; close() closes only this caller's contexts.
+    """
+
+    def __init__(self, browser):
+        self._browser = browser
+        self._contexts = []
+
+    async def new_context(self, **kwargs):
+        context = await self._browser.new_context(**kwargs)
+        self._contexts.append(context)
+        return context
+
+    async def new_page(self, **kwargs):
+        context = await self.new_context(**kwargs)
+        return await context.new_page()
+
+    async def close(self):
+        contexts, self._contexts = self._contexts, []
+        for context in contexts:
+            try:
+                await context.close()
+            except Exception:
+                pass
+
+
+@asynccontextmanager
+async def shared_browser_lease():
+    """Borrow the shared browser; every context opened through the lease is closed on exit."""
+    lease = _BrowserLease(await _get_shared_browser())
+    try:
+        yield lease
+    finally:
+        await lease.close()
+
+
+async def close_shared_browser():
+    """Shut down the shared browser (called from the API lifespan on shutdown)."""
+    global _shared_playwright, _shared_browser
+    try:
+        if _shared_browser is not None:
+            await _shared_browser.close()
+        if _shared_playwright is not None:
+            await _shared_playwright.stop()
+    except Exception as e:
+        logger.warning(f"HCAD: Error closing shared browser: {e}")
+    finally:
+        _shared_playwright = _shared_browser = None
+
 class HCADScraper(AppraisalDistrictConnector):
     """
     ULTRA-ROBUST SCRAPER for Harris County Appraisal District (HCAD).
@@ -53,14 +139,15 @@ class HCADScraper(AppraisalDistrictConnector):
     def __init__(self):
         self.portal_url = "https://search.hcad.org/"
 
-    async def get_property_details(self, account_number: str, address: Optional[str] = None) -> Optional[Dict]:
+    async def get_property_details(self, account_number: str, address: Optional[str] = None,
+                                   cached_record: Optional[Dict] = None) -> Optional[Dict]:
         logger.info(f"Looking up live data for HCAD account: {account_number}")
 
         # 0. Supabase bulk-data lookup (fastest — no browser needed, works on cloud)
         #    Populated by scripts/hcad_bulk_import.py from HCAD's annual data files.
         try:
             from backend.db.supabase_client import supabase_service
-            cached = await supabase_service.get_property_by_account(account_number)
+            cached = cached_record if cached_record is not None else await supabase_service.get_property_by_account(account_number)
             if cached and cached.get('address') and cached.get('district') == 'HCAD':
                 # Only trust this cache if it has real scraped fields — not a ghost/placeholder record
                 has_real_value = cached.get('appraised_value') and cached.get('appraised_value') not in (450000, 0)
@@ -169,10 +256,9 @@ class HCADScraper(AppraisalDistrictConnector):
         return False
 
     async def _scrape_new_portal_human(self, account_number: str, address: Optional[str] = None) -> Optional[Dict]:
-        async with async_playwright() as p:
-            browser = None
+        async with _shared_browser_session() as browser:
+            context = None
             try:
-                browser = await _launch_browser(p)
                 context = await browser.new_context(
                     user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
                     viewport={'width': 1920, 'height': 1080},
@@ -625,8 +711,8 @@ class HCADScraper(AppraisalDistrictConnector):
                 import traceback
                 logger.error(traceback.format_exc())
             finally:
-                if browser:
-                    await browser.close()
+                if context:
+                    await context.close()
         return None
 
     async def get_neighbors_by_street(self, street_name: str, search_term: str = None) -> List[Dict]:
@@ -641,11 +727,10 @@ class HCADScraper(AppraisalDistrictConnector):
         """
         actual_search = search_term or street_name
         logger.info(f"HCAD: Discovering neighbors on street: {street_name} (search: '{actual_search}')")
-        async with async_playwright() as p:
+        async with _shared_browser_session() as browser:
             neighbors = []
-            browser = None
+            context = None
             try:
-                browser = await _launch_browser(p)
                 context = await browser.new_context(
                     user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"
                 )
@@ -726,8 +811,8 @@ class HCADScraper(AppraisalDistrictConnector):
                 logger.error(f"HCAD: Street neighbor discovery failed: {e}")
                 return []
             finally:
-                if browser:
-                    await browser.close()
+                if context:
+                    await context.close()
 
     async def get_neighbors(self, neighborhood_code: str) -> List[Dict]:
         """
@@ -1,18 +1,37 @@
 import os
-import requests
+import re
+import copy
+import httpx
 import logging
 from typing import Optional, Dict
+from cachetools import TTLCache
 
-from backend.utils.address_utils import normalize_address_for_search, fuzzy_best_match
+from backend.utils.address_utils import normalize_address_for_search, fuzzy_best_match, district_from_address
+from backend.utils.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
+# RentCast property records (sale history, assessor ID, tax assessments) change rarely.
+# Shared across RentCastAgent instances so every bridge/agent reuses the same lookups.
+RENTCAST_CACHE_TTL_SECONDS = 86400
+RENTCAST_MISS_TTL_SECONDS = 3600
+_rentcast_cache = TTLCache(maxsize=10_000, ttl=RENTCAST_CACHE_TTL_SECONDS)
+_rentcast_misses = TTLCache(maxsize=10_000, ttl=RENTCAST_MISS_TTL_SECONDS)
+_ADDR_KEY_RX = re.compile(r"[^\w\s]")
+
+
+def _address_key(address: str) -> str:
+    """Case/punctuation/whitespace-insensitive cache key for an address."""
+    return " ".join(_ADDR_KEY_RX.sub(" ", address).upper().split())
+
 class RentCastAgent:
-    def __init__(self):
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
         self.api_key = os.getenv("RENTCAST_API_KEY")
         self.base_url = "https://api.rentcast.io/v1/properties"
+        # None -> the pooled process-wide client from backend.utils.http_client
+        self.http_client = http_client
 
-    def _fetch_property(self, address: str) -> Optional[dict]:
+    async def _fetch_property(self, address: str) -> Optional[dict]:
         """
         Single internal call to /v1/properties for a given address.
         Returns the first matching property dict, or None.
@@ -24,18 +43,32 @@ class RentCastAgent:
         if not address or not address.strip() or not any(c.isalpha() for c in address):
             logger.info(f"RentCast: Skipping fetch — address is empty or numeric-only: '{address}'")
             return None
+        key = _address_key(address)
+        hit = _rentcast_cache.get(key)
+        if hit is not None:
+            logger.info(f"RentCast: Cache hit for '{address}'")
+            # Callers embed the payload in property_details — never hand out the memo itself
+            return copy.deepcopy(hit)
+        if key in _rentcast_misses:
+            return None
         try:
             headers = {"X-Api-Key": self.api_key, "accept": "application/json"}
-            resp = requests.get(self.base_url, headers=headers,
-                                params={"address": address}, timeout=10)
+            client = self.http_client or get_http_client()
+            resp = await client.get(self.base_url, headers=headers,
+                                    params={"address": address}, timeout=10)
             if resp.status_code == 200:
                 data = resp.json()
+                prop = None
                 if isinstance(data, list) and data:
-                    return data[0]
-                if isinstance(data, dict) and data:
-                    return data
+                    prop = data[0]
+                elif isinstance(data, dict) and data:
+                    prop = data
+                if prop:
+                    _rentcast_cache[key] = copy.deepcopy(prop)
+                return prop
             elif resp.status_code == 404:
                 logger.info(f"RentCast: No record for '{address}' (404).")
+                _rentcast_misses[key] = True
             else:
                 logger.warning(f"RentCast returned {resp.status_code} for '{address}'")
         except Exception as e:
@@ -50,7 +83,7 @@ class RentCastAgent:
         if not address or not address.strip() or not any(c.isalpha() for c in address):
             return None
         logger.info(f"Resolving Address via RentCast: {address}")
-        prop = self._fetch_property(address)
+        prop = await self._fetch_property(address)
         if prop:
             ptype = prop.get("propertyType")
             logger.info(f"RentCast propertyType for '{address}': {ptype}")
@@ -66,7 +99,7 @@ class RentCastAgent:
         if not self.api_key:
             logger.warning("RentCast API Key missing.")
             return None
-        prop = cached_prop or self._fetch_property(address)
+        prop = cached_prop or await self._fetch_property(address)
         if prop:
             sale_price = prop.get("lastSalePrice")
             logger.info(f"RentCast found sale price: {sale_price}")
@@ -85,7 +118,7 @@ class RentCastAgent:
         if not self.api_key:
             return None
         logger.info(f"Resolving Address via RentCast: {address}")
-        prop = self._fetch_property(address)
+        prop = await self._fetch_property(address)
         if not prop:
             return None
 
@@ -115,8 +148,8 @@ class RentCastAgent:
 
 
 class NonDisclosureBridge:
-    def __init__(self):
-        self.rentcast = RentCastAgent()
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+        self.rentcast = RentCastAgent(http_client=http_client)
 
     async def get_last_sale_price(self, address: str,
                                   resolved_data: Optional[Dict] = None) -> Optional[Dict]:
@@ -245,19 +278,9 @@ class NonDisclosureBridge:
         # Infer district from city name in address when no explicit district given
         inferred_district = district
         if not inferred_district and normalized:
-            addr_lower = normalized.lower()
-            CITY_TO_DISTRICT = {
-                "plano": "CCAD", "mckinney": "CCAD", "frisco": "CCAD", "allen": "CCAD",
-                "dallas": "DCAD", "irving": "DCAD", "garland": "DCAD",
-                "austin": "TCAD", "round rock": "TCAD",
-                "fort worth": "TAD", "arlington": "TAD",
-                "houston": "HCAD", "katy": "HCAD", "sugar land": "HCAD",
-            }
-            for city, dist in CITY_TO_DISTRICT.items():
-                if city in addr_lower:
-                    inferred_district = dist
-                    logger.info(f"resolve_account_id: inferred district '{dist}' from city '{city}' in address")
-                    break
+            inferred_district = district_from_address(normalized)
+            if inferred_district:
+                logger.info(f"resolve_account_id: inferred district '{inferred_district}' from address")
 
         # Try inferred district first, then sweep API-based connectors
         districts_to_try = []
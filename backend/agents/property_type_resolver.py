@@ -12,11 +12,17 @@ multiple data sources in priority order:
 Returns: ("Residential" | "Commercial" | "Unknown", source_description)
 """
 
+import asyncio
 import logging
 from typing import Tuple, Optional
 
+from cachetools import TTLCache
+
 logger = logging.getLogger(__name__)
 
+# (account, address, district) -> (type, source) from the API/scraper layers, 15 minutes
+_remote_type_cache = TTLCache(maxsize=2048, ttl=900)
+
 # ── HCAD State Class → Property Type Mapping ─────────────────────────────
 # A = Real Residential    B = Mobile Home       C = Vacant Lot
 # D = Qualified Ag Land   E = Exempt            F = Commercial Real
@@ -88,8 +94,8 @@ async def resolve_property_type(
     # ── Layer 1: HCAD Bulk DB (state_class column) ────────────────────
     try:
         from backend.db.supabase_client import supabase_service
-        prop = cached_property  # Reuse pre-fetched record if available
-        if not prop:
+        prop = cached_property  # Reuse pre-fetched record if available ({} = known missing)
+        if prop is None:
             prop = await supabase_service.get_property_by_account(account_number)
         if prop and prop.get("state_class"):
             sc = prop["state_class"]
@@ -100,6 +106,20 @@ async def resolve_property_type(
     except Exception as e:
         logger.warning(f"PropertyTypeResolver: DB lookup failed: {e}")
 
+    # Remote layers cost API calls (or a browser launch) — reuse a recent answer
+    key = ((account_number or "").strip().upper(), " ".join((address or "").upper().split()), district)
+    hit = _remote_type_cache.get(key)
+    if hit is not None:
+        return hit
+    result = await _resolve_from_remote_sources(account_number, address, district)
+    if result[0] != "Unknown":  # a miss may be a transient API failure; retry next time
+        _remote_type_cache[key] = result
+    return result
+
+
+async def _resolve_from_remote_sources(account_number: str, address: str, district: str) -> Tuple[str, str]:
+    """Layers 2-4 of resolve_property_type (everything after the DB check)."""
+
     # ── Layer 2: RentCast API ─────────────────────────────────────────
     # Guard: skip RentCast if address is empty or purely numeric (account number)
     has_real_address = address and any(c.isalpha() for c in address)
@@ -126,7 +146,7 @@ async def resolve_property_type(
     try:
         from backend.agents.realestate_api_connector import RealEstateAPIConnector
         re_api = RealEstateAPIConnector()
-        details = re_api.get_property_detail(address)
+        details = await asyncio.to_thread(re_api.get_property_detail, address)
         if details:
             # Check normalized propertyType + raw landUse/propertyUse fields
             raw = details.get("_raw", {})
@@ -153,6 +173,7 @@ async def resolve_property_type(
     if district == "HCAD" and account_number and not any(c.isalpha() for c in account_number):
         try:
             from backend.agents.hcad_scraper import HCADScraper
+            from backend.db.supabase_client import supabase_service
             scraper = HCADScraper()
             scraped = await scraper.get_property_details(account_number, address)
             if scraped and scraped.get("property_type"):
@@ -161,9 +182,11 @@ async def resolve_property_type(
                 if ptype:
                     # Also save to DB for next time
                     try:
-                        await supabase_service.client.table("properties").update(
-                            {"state_class": sc}
-                        ).eq("account_number", account_number).execute()
+                        await asyncio.to_thread(
+                            supabase_service.client.table("properties").update(
+                                {"state_class": sc}, returning="minimal"
+                            ).eq("account_number", account_number).execute
+                        )
                     except:
                         pass
                     logger.info(f"PropertyTypeResolver: {ptype} from HCAD scraper state_class='{sc}' for {account_number}")
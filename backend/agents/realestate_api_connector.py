@@ -4,10 +4,10 @@ import logging
 import time
 from typing import List, Optional
 from tenacity import retry, wait_exponential, stop_after_attempt, retry_if_exception_type
-from dotenv import load_dotenv
+from backend.utils.env_utils import load_env
 from backend.models.sales_comp import SalesComparable
 
-load_dotenv()
+load_env()
 
 logger = logging.getLogger(__name__)
 
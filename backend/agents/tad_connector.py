@@ -2,8 +2,8 @@ import asyncio
 import logging
 import re
 from typing import Dict, List, Optional
-from playwright.async_api import async_playwright
 from .base_connector import AppraisalDistrictConnector
+from .hcad_scraper import shared_browser_lease
 
 logger = logging.getLogger(__name__)
 
@@ -15,7 +15,8 @@ class TADConnector(AppraisalDistrictConnector):
     def __init__(self):
         self.base_url = "https://www.tad.org"
 
-    async def get_property_details(self, account_number: str, address: Optional[str] = None) -> Dict:
+    async def get_property_details(self, account_number: str, address: Optional[str] = None,
+                                   cached_record: Optional[Dict] = None) -> Dict:
         """
         Scrapes property details from TAD.org given an account number.
         Step 0: Check Supabase bulk-data first — instant lookup, no browser needed.
@@ -24,7 +25,7 @@ class TADConnector(AppraisalDistrictConnector):
         # 0. Supabase cache-first lookup
         try:
             from backend.db.supabase_client import supabase_service
-            cached = await supabase_service.get_property_by_account(account_number)
+            cached = cached_record if cached_record is not None else await supabase_service.get_property_by_account(account_number)
             if cached and cached.get('address') and cached.get('district') == 'TAD':
                 logger.info(f"TAD: Returning cached record for {account_number} (no scraping needed).")
                 return cached
@@ -32,8 +33,7 @@ class TADConnector(AppraisalDistrictConnector):
             logger.warning(f"TAD: Supabase cache lookup failed: {e}")
 
         # 1. Playwright scraping fallback
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
+        async with shared_browser_lease() as browser:
             context = await browser.new_context(
                 user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
             )
@@ -258,8 +258,7 @@ class TADConnector(AppraisalDistrictConnector):
         except Exception as e:
             logger.warning(f"TAD: Supabase neighbor lookup failed: {e}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
+        async with shared_browser_lease() as browser:
             context = await browser.new_context(
                 user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
             )
@@ -362,23 +361,19 @@ class TADConnector(AppraisalDistrictConnector):
         """
         Checks if TAD website is reachable.
         """
-        async with async_playwright() as p:
-            try:
-                browser = await p.chromium.launch(headless=True)
+        try:
+            async with shared_browser_lease() as browser:
                 page = await browser.new_page()
                 response = await page.goto(self.base_url, timeout=30000)
-                status = response.ok
-                await browser.close()
-                return status
-            except Exception:
-                return False
+                return response.ok
+        except Exception:
+            return False
 
     async def get_neighbors_by_street(self, street_name: str) -> List[Dict]:
         """
         Custom Discovery: Search by street name directly on TAD.org
         """
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
+        async with shared_browser_lease() as browser:
             context = await browser.new_context(
                 user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
             )
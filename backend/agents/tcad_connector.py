@@ -2,8 +2,8 @@ import asyncio
 import logging
 import re
 from typing import Dict, List, Optional
-from playwright.async_api import async_playwright
 from .base_connector import AppraisalDistrictConnector
+from .hcad_scraper import shared_browser_lease
 
 logger = logging.getLogger(__name__)
 
@@ -34,7 +34,8 @@ class TCADConnector(AppraisalDistrictConnector):
         else:
             await page.keyboard.press("Enter")
 
-    async def get_property_details(self, account_number: str, address: Optional[str] = None) -> Dict:
+    async def get_property_details(self, account_number: str, address: Optional[str] = None,
+                                   cached_record: Optional[Dict] = None) -> Dict:
         """
         Scrapes property details from TCAD given an account number (PROP_ID).
         Step 0: Check Supabase bulk-data first — instant lookup, no browser needed.
@@ -43,7 +44,7 @@ class TCADConnector(AppraisalDistrictConnector):
         # 0. Supabase bulk-data lookup (works on cloud, no browser)
         try:
             from backend.db.supabase_client import supabase_service
-            cached = await supabase_service.get_property_by_account(account_number)
+            cached = cached_record if cached_record is not None else await supabase_service.get_property_by_account(account_number)
             if cached and cached.get('address') and cached.get('district') == 'TCAD':
                 logger.info(f"TCAD: Returning bulk-data record for {account_number} (no scraping needed).")
                 return cached
@@ -51,8 +52,7 @@ class TCADConnector(AppraisalDistrictConnector):
             logger.warning(f"TCAD: Supabase bulk lookup failed: {e}")
 
         # 1. Playwright scraping fallback
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
+        async with shared_browser_lease() as browser:
             context = await browser.new_context(
                 user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
             )
@@ -204,8 +204,7 @@ class TCADConnector(AppraisalDistrictConnector):
             logger.warning(f"TCAD: Supabase street lookup failed: {e}")
 
         # 1. Playwright scraping fallback
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
+        async with shared_browser_lease() as browser:
             context = await browser.new_context()
             page = await context.new_page()
             
@@ -281,8 +280,7 @@ class TCADConnector(AppraisalDistrictConnector):
             logger.warning(f"TCAD: Supabase neighbor lookup failed: {e}")
         
         logger.info(f"TCAD: Searching for neighborhood code: {neighborhood_code}")
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
+        async with shared_browser_lease() as browser:
             context = await browser.new_context()
             page = await context.new_page()
             
@@ -334,13 +332,10 @@ class TCADConnector(AppraisalDistrictConnector):
                 await browser.close()
 
     async def check_service_status(self) -> bool:
-        async with async_playwright() as p:
-            try:
-                browser = await p.chromium.launch(headless=True)
+        try:
+            async with shared_browser_lease() as browser:
                 page = await browser.new_page()
                 response = await page.goto(self.base_url, timeout=30000)
-                status = response.ok
-                await browser.close()
-                return status
-            except Exception:
-                return False
+                return response.ok
+        except Exception:
+            return False
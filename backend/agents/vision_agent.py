@@ -4,13 +4,22 @@ import logging
 import json
 import math
 import base64
+import threading
 from typing import Optional, List, Dict
+from cachetools import TTLCache
 from google import genai
 from openai import OpenAI
 from PIL import Image, ImageDraw
 
 logger = logging.getLogger(__name__)
 
+# Geocodes keyed by folded address. The pipeline geocodes the subject for FEMA, then
+# get_street_view_images geocodes it again; repeat protests hit the same addresses too.
+# Called from worker threads (asyncio.to_thread), so access is locked.
+GEOCODE_CACHE_TTL_SECONDS = 30 * 86400
+_geocode_cache = TTLCache(maxsize=20_000, ttl=GEOCODE_CACHE_TTL_SECONDS)
+_geocode_cache_lock = threading.Lock()
+
 class VisionAgent:
     def __init__(self):
         self.google_api_key = os.getenv("GOOGLE_STREET_VIEW_API_KEY")
@@ -72,6 +81,11 @@ class VisionAgent:
     def _geocode_address(self, address: str) -> Optional[Dict[str, float]]:
         if not self.google_api_key:
             return None
+        key = " ".join(str(address).lower().split())
+        with _geocode_cache_lock:
+            hit = _geocode_cache.get(key)
+        if hit is not None:
+            return dict(hit)
         try:
             url = "https://maps.googleapis.com/maps/api/geocode/json"
             params = {"address": address, "key": self.google_api_key}
@@ -80,7 +94,10 @@ class VisionAgent:
                 data = response.json()
                 if data["status"] == "OK":
                     location = data["results"][0]["geometry"]["location"]
-                    return {"lat": location["lat"], "lng": location["lng"]}
+                    coords = {"lat": location["lat"], "lng": location["lng"]}
+                    with _geocode_cache_lock:
+                        _geocode_cache[key] = coords
+                    return dict(coords)
                 else:
                     logger.warning(f"Geocoding failed status: {data['status']}. Msg: {data.get('error_message', 'No message')}")
             else:
@@ -1,15 +1,194 @@
+import asyncio
 import os
+import re
+import copy
 import json
 import logging
-from datetime import datetime, timezone
-from supabase import create_client, Client
-from dotenv import load_dotenv
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Optional
+from cachetools import TTLCache
+from backend.utils.env_utils import load_env
+from backend.utils.address_utils import ADDR_PUNCT_TABLE
 
-load_dotenv()
+if TYPE_CHECKING:
+    from supabase import Client
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import asyncpg
+    HAS_ASYNCPG = True
+except ImportError:
+    HAS_ASYNCPG = False
+
+load_env()
+
+__all__ = ["supabase_service", "SupabaseService"]
 
 logger = logging.getLogger(__name__)
 
 COMP_CACHE_TTL_DAYS = 30  # Cached comps are considered fresh for 30 days
+MEM_CACHE_TTL_SECONDS = 60  # In-process memo for repeated reads within one pipeline run
+NEG_CACHE_TTL_SECONDS = 300  # How long a "no sale on record" answer is trusted
+
+# One keep-alive HTTP/2 connection pool shared by every PostgREST call from this process.
+# Calls run via asyncio.to_thread, whose default executor tops out at 32 workers,
+# so more than 32 connections can never be in use at once.
+SUPABASE_HTTP_MAX_KEEPALIVE = 20
+SUPABASE_HTTP_MAX_CONNECTIONS = 32
+SUPABASE_HTTP_TIMEOUT = 30
+
+# Optional direct Postgres pool for the hot read paths. SUPABASE_DB_URL should be the
+# Supavisor transaction-mode URI (port 6543); writes stay on PostgREST either way.
+SUPABASE_DB_POOL_MIN = 2
+SUPABASE_DB_POOL_MAX = 10
+_PG_UNAVAILABLE = object()  # _pg_value sentinel: no pool, or the query failed
+
+# name -> (data_col, ts_col, ttl_days) for the JSON cache columns on `properties`
+FIELD_CACHE_SPECS = {
+    "sales":  ("sales_cache",  "sales_fetched_at",  30),
+    "flood":  ("flood_cache",  "flood_fetched_at",  365),
+    "vision": ("vision_cache", "vision_fetched_at", 90),
+    "market": ("market_cache", "market_fetched_at", 30),
+}
+
+# Whitelist of known columns on equity_comparables — prevents PGRST204 on unknown fields
+EQUITY_COMP_COLS = frozenset({
+    'protest_id', 'account_number', 'address', 'owner_name',
+    'distance', 'similarity', 'appraised_val', 'market_val',
+    'sqft', 'year_built', 'grade', 'cdu', 'adjustments',
+    'neighborhood_code', 'building_area', 'appraised_value',
+})
+
+# Lightweight `properties` projection for readers that only display/identify a property —
+# excludes the JSONB caches (cached_comps, *_cache), valuation_history and the embedding
+PROPERTY_CORE_COLS = (
+    "account_number, address, district, appraised_value, market_value, building_area, "
+    "land_area, year_built, neighborhood_code, building_grade, building_quality, last_sale_date"
+)
+
+# Columns the report views read from `protests` — excludes the large JSONB snapshots
+PROTEST_SUMMARY_COLS = "id, account_number, created_at, status, narrative, market_value, pdf_url"
+
+# Strips currency/unit decoration from RentCast-style display strings ("$1,234 (est)", "0.4 mi")
+_NUM_CLEAN_RX = re.compile(r"\$|,| \(est\)| mi|\s")
+
+# sales_comparables column -> accepted source keys (display-formatted first, then snake_case)
+_SALES_FIELD_KEYS = {
+    "address": ("Address", "address"),
+    "sale_price": ("Sale Price", "sale_price"),
+    "sale_date": ("Sale Date", "sale_date"),
+    "sqft": ("SqFt", "sqft"),
+    "price_per_sqft": ("Price/SqFt", "price_per_sqft"),
+    "year_built": ("Year Built", "year_built"),
+    "dist_from_subject": ("Distance", "distance", "dist_from_subject"),
+    "property_type": ("Type", "property_type"),
+}
+
+
+def _json_dumps(value) -> str:
+    """Serialize a cache blob; orjson when available (much faster on large comp lists)."""
+    if HAS_ORJSON:
+        return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(value)
+
+
+def _json_loads(raw):
+    """Deserialize a cache blob stored as a JSON string."""
+    return orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+
+
+async def _init_pg_connection(con):
+    # Decode json/jsonb like PostgREST does, so both paths hand back the same shapes
+    for typ in ("json", "jsonb"):
+        await con.set_type_codec(typ, schema="pg_catalog", encoder=_json_dumps, decoder=_json_loads)
+
+
+def _utc_cutoff(ttl_days: int, now: Optional[datetime] = None) -> datetime:
+    """Oldest timestamp still inside a `ttl_days` TTL; pass `now` to share one clock read across fields."""
+    return (now or datetime.now(timezone.utc)) - timedelta(days=ttl_days)
+
+
+def _parse_ts(ts: str) -> datetime:
+    """Parse a PostgREST timestamptz string (older Pythons' fromisoformat rejects a trailing 'Z')."""
+    return datetime.fromisoformat(ts[:-1] + "+00:00" if ts.endswith("Z") else ts)
+
+
+def _nbhd_code_filters(neighborhood_code) -> tuple:
+    """
+    Returns (base_code, LIKE prefix, anchored regex) matching every variation of a
+    neighborhood code (e.g. 8401, 8401.00, 8401.01, 8014A, 8014 A). The prefix LIKE
+    narrows via the (district, neighborhood_code, building_area) index
+    (migrations/008); the regex then rejects longer codes like 84010.
+    """
+    base_code = str(neighborhood_code).split('.')[0].strip()
+    return base_code, f"{base_code}%", f"^{re.escape(base_code)}(\\.[0-9]+| ?[A-Z])?$"
+
+
+def _first(d: dict, keys: tuple):
+    """Equivalent of d.get(k1) or d.get(k2) or ... for a tuple of keys."""
+    value = None
+    for k in keys:
+        value = d.get(k)
+        if value:
+            return value
+    return value
+
+
+def _to_float(x):
+    if not isinstance(x, str):
+        return x
+    s = _NUM_CLEAN_RX.sub("", x)
+    try:
+        return float(s) if s else None
+    except ValueError:
+        return None
+
+
+def _to_int(x):
+    if not isinstance(x, str):
+        return x
+    s = _NUM_CLEAN_RX.sub("", x)
+    return int(s) if s.isdigit() else None
+
+
+def _sales_comp_record(account_number: str, protest_id: str, comp) -> dict:
+    """Normalize one sales comp (dict or pydantic model) into a sales_comparables row."""
+    comp_dict = comp if isinstance(comp, dict) else comp.model_dump()
+
+    sale_date = _first(comp_dict, _SALES_FIELD_KEYS["sale_date"])
+    if isinstance(sale_date, str) and "(Loan)" in sale_date:
+        sale_date = sale_date.replace(" (Loan)", "").strip()
+    if not sale_date or sale_date == "Unknown":
+        sale_date = None
+
+    year_built = _first(comp_dict, _SALES_FIELD_KEYS["year_built"])
+    if year_built == "N/A":
+        year_built = None
+
+    prop_type = _first(comp_dict, _SALES_FIELD_KEYS["property_type"])
+    if isinstance(prop_type, str) and "(Inferred)" in prop_type:
+        prop_type = prop_type.replace(" (Inferred)", "").strip()
+
+    return {
+        "account_number": account_number,
+        "protest_id": protest_id,
+        "address": _first(comp_dict, _SALES_FIELD_KEYS["address"]),
+        "sale_price": _to_float(_first(comp_dict, _SALES_FIELD_KEYS["sale_price"])),
+        "sale_date": sale_date,
+        "sqft": _to_int(_first(comp_dict, _SALES_FIELD_KEYS["sqft"])),
+        "price_per_sqft": _to_float(_first(comp_dict, _SALES_FIELD_KEYS["price_per_sqft"])),
+        "year_built": year_built,
+        "source": comp_dict.get("Source") or comp_dict.get("source", "RentCast"),
+        "dist_from_subject": _to_float(_first(comp_dict, _SALES_FIELD_KEYS["dist_from_subject"])),
+        "similarity_score": comp_dict.get("similarity", comp_dict.get("similarity_score")),
+        "property_type": prop_type,
+    }
+
 
 class SupabaseService:
     def __init__(self):
@@ -19,43 +198,227 @@ class SupabaseService:
             logger.error("SUPABASE_URL is not set — all database operations will be skipped. Set it in .env.")
         if not self.key:
             logger.error("SUPABASE_KEY is not set — all database operations will be skipped. Set it in .env.")
-        if self.url and self.key:
+        # Built on first use — importing supabase-py (httpx, postgrest, auth, ...) is slow
+        # and many entry points (tests, schema helpers) never touch the database.
+        self._client: Optional["Client"] = None
+        self._client_init_failed = False
+        self.db_url = os.getenv("SUPABASE_DB_URL")
+        self._pg = None
+        self._pg_loop = None
+        self._pg_lock: Optional[asyncio.Lock] = None
+        self._pg_init_failed = False
+        # (account_number, data_col) -> decoded cache blob, shared across pipeline stages;
+        # (account_number, "row") -> full properties row
+        self._mem_cache = TTLCache(maxsize=4096, ttl=MEM_CACHE_TTL_SECONDS)
+        # Accounts with no sale date in properties or property_deeds — skip both queries for a while
+        self._neg_last_sale = TTLCache(maxsize=10_000, ttl=NEG_CACHE_TTL_SECONDS)
+
+    @property
+    def client(self) -> Optional["Client"]:
+        if self._client is None and self.url and self.key and not self._client_init_failed:
             try:
-                self.client: Client = create_client(self.url, self.key)
+                import httpx
+                from supabase import create_client, ClientOptions
+                http_client = httpx.Client(
+                    http2=True,
+                    limits=httpx.Limits(
+                        max_keepalive_connections=SUPABASE_HTTP_MAX_KEEPALIVE,
+                        max_connections=SUPABASE_HTTP_MAX_CONNECTIONS,
+                    ),
+                    timeout=SUPABASE_HTTP_TIMEOUT,
+                )
+                self._client = create_client(self.url, self.key, options=ClientOptions(httpx_client=http_client))
                 logger.debug("Supabase client initialized successfully.")
             except Exception as e:
                 logger.error(f"Supabase client initialization failed: {e}. Database operations will be disabled.")
-                self.client = None
-        else:
-            self.client = None
+                self._client_init_failed = True
+        return self._client
+
+    @client.setter
+    def client(self, value):
+        self._client = value
+
+    async def _run(self, query):
+        """
+        Execute a PostgREST/RPC builder on a worker thread.
+        supabase-py is synchronous; calling .execute() inline would block the event
+        loop for the whole HTTP round-trip and serialize every concurrent request.
+        """
+        return await asyncio.to_thread(query.execute)
+
+    async def _pg_pool(self):
+        """asyncpg pool on SUPABASE_DB_URL, created on first use; None when not configured."""
+        if not HAS_ASYNCPG or not self.db_url or self._pg_init_failed:
+            return None
+        loop = asyncio.get_running_loop()
+        if self._pg_loop is not loop:
+            # Scripts call asyncio.run() repeatedly — a pool bound to a dead loop is unusable
+            self._pg, self._pg_loop, self._pg_lock = None, loop, asyncio.Lock()
+        if self._pg is None:
+            async with self._pg_lock:
+                if self._pg is None and not self._pg_init_failed:
+                    try:
+                        self._pg = await asyncpg.create_pool(
+                            self.db_url,
+                            min_size=SUPABASE_DB_POOL_MIN,
+                            max_size=SUPABASE_DB_POOL_MAX,
+                            statement_cache_size=0,  # transaction pooling can't keep prepared statements
+                            init=_init_pg_connection,
+                        )
+                        logger.debug("Direct Postgres pool initialized.")
+                    except Exception as e:
+                        logger.error(f"Direct Postgres pool failed ({e}); reads will use PostgREST.")
+                        self._pg_init_failed = True
+        return self._pg
+
+    async def close_pg_pool(self):
+        """Close the direct Postgres pool (called from the API lifespan on shutdown)."""
+        try:
+            if self._pg is not None and self._pg_loop is asyncio.get_running_loop():
+                await self._pg.close()
+        except Exception as e:
+            logger.warning(f"Error closing direct Postgres pool: {e}")
+        finally:
+            self._pg = None
 
-    async def get_property_by_account(self, account_number: str):
+    async def _pg_value(self, sql: str, *args):
+        """
+        First column of the first row over the direct pool — skips the PostgREST HTTPS hop.
+        Returns _PG_UNAVAILABLE when no pool is configured or the query fails, so the
+        caller falls through to its PostgREST query.
+        """
+        pool = await self._pg_pool()
+        if pool is None:
+            return _PG_UNAVAILABLE
+        try:
+            return await pool.fetchval(sql, *args)
+        except Exception as e:
+            logger.warning(f"Direct Postgres read failed, using PostgREST: {e}")
+            return _PG_UNAVAILABLE
+
+    async def _rpc_value(self, name: str, params: dict):
+        """Call a SQL function that returns one json/jsonb value; direct pool first, then PostgREST."""
+        args = ", ".join(f"{k} => ${i}" for i, k in enumerate(params, 1))
+        value = await self._pg_value(f"SELECT {name}({args})", *params.values())
+        if value is not _PG_UNAVAILABLE:
+            return value
+        rest_params = {k: v.isoformat() if isinstance(v, datetime) else v for k, v in params.items()}
+        response = await self._run(self.client.rpc(name, rest_params))
+        return response.data
+
+    async def get_property_by_account(self, account_number: str, fields: str = "*"):
+        """
+        Fetches the property row for an account. Defaults to the full row (the pipelines
+        use it as property_details); pass PROPERTY_CORE_COLS or an explicit column list
+        when the JSONB caches aren't needed.
+        """
         if not self.client: return None
-        response = self.client.table("properties").select("*").eq("account_number", account_number).execute()
-        return response.data[0] if response.data else None
+        # Full rows are memoized (retries and the DB-first stages re-read the same account);
+        # every write path below drops the entry
+        key = (account_number, "row")
+        if fields == "*":
+            hit = self._mem_cache.get(key)
+            if hit is not None:
+                return copy.deepcopy(hit)
+            # to_jsonb renders the row exactly as PostgREST would (ISO timestamps, plain numbers)
+            row = await self._pg_value(
+                "SELECT to_jsonb(p) FROM properties p WHERE p.account_number = $1 LIMIT 1", account_number
+            )
+            if row is _PG_UNAVAILABLE:
+                response = await self._run(self.client.table("properties").select(fields).eq("account_number", account_number))
+                row = response.data[0] if response.data else None
+        else:
+            response = await self._run(self.client.table("properties").select(fields).eq("account_number", account_number))
+            row = response.data[0] if response.data else None
+        if row and fields == "*":
+            self._mem_cache[key] = copy.deepcopy(row)
+        return row
 
-    async def upsert_property(self, property_data: dict):
+    async def upsert_property(self, property_data: dict, returning: Optional[str] = None):
+        """
+        Upserts a property by account_number. By default nothing is echoed back;
+        pass a column list (e.g. returning="id") to get just those columns of the
+        stored row instead of the whole thing, JSONB caches included.
+        """
         if not self.client: return None
-        response = self.client.table("properties").upsert(property_data, on_conflict="account_number").execute()
+        self._mem_cache.pop((property_data.get("account_number"), "row"), None)
+        query = self.client.table("properties").upsert(
+            property_data, on_conflict="account_number", returning="minimal",
+        )
+        if returning:
+            query = query.select(returning)  # also switches Prefer to return=representation
+        response = await self._run(query)
         return response.data[0] if response.data else None
 
+    async def upsert_properties(self, rows: list):
+        """
+        Bulk upsert by account_number, one request per distinct column set. Rows that
+        omit a column must not send it (PostgREST would overwrite the stored value
+        with NULL), so rows are only batched with others that carry the same keys.
+        """
+        if not self.client or not rows: return
+        batches = {}
+        for row in rows:
+            if row.get("account_number"):
+                self._mem_cache.pop((row["account_number"], "row"), None)
+                batches.setdefault(frozenset(row), []).append(row)
+        for batch in batches.values():
+            try:
+                await self._run(self.client.table("properties").upsert(
+                    batch, on_conflict="account_number", returning="minimal",
+                ))
+                continue
+            except Exception as e:
+                logger.warning(f"Bulk upsert of {len(batch)} properties failed, retrying per row: {e}")
+            # Fallback: a single bad row shouldn't lose the rest of the batch
+            for row in batch:
+                try:
+                    await self.upsert_property(row)
+                except Exception as e:
+                    logger.error(f"Failed to upsert property {row.get('account_number')}: {e}")
+
     async def save_protest(self, protest_data: dict):
         if not self.client: return None
-        response = self.client.table("protests").insert(protest_data).execute()
+        response = await self._run(self.client.table("protests").insert(protest_data))
         return response.data[0] if response.data else None
 
-    async def get_latest_protest(self, account_number: str):
+    async def save_protest_for_account(self, account_number: str, protest_data: dict):
+        """
+        Saves a protest when the caller doesn't already hold the properties.id.
+        The save_protest_for_account RPC (migrations/015) resolves the property and
+        inserts in one round-trip; returns None if the account has no properties row.
+        """
+        if not self.client: return None
+        try:
+            response = await self._run(self.client.rpc("save_protest_for_account", {
+                "p_account_number": account_number,
+                "p_protest": protest_data,
+            }))
+            return response.data or None
+        except Exception as e:
+            logger.warning(f"save_protest_for_account RPC failed, falling back to separate queries: {e}")
+
+        prop_record = await self.get_property_by_account(account_number, fields="id")
+        if not prop_record:
+            return None
+        return await self.save_protest({**protest_data, "account_number": account_number, "property_id": prop_record["id"]})
+
+    async def get_latest_protest(self, account_number: str, fields: str = PROTEST_SUMMARY_COLS):
         """
         Fetches the most recent protest generated for this account.
+        Returns only the summary columns by default; pass fields="*" to also pull
+        the JSONB snapshots (property_data, equity_data, vision_data).
         """
         if not self.client: return None
         try:
-            response = self.client.table("protests") \
-                .select("*") \
-                .eq("account_number", account_number) \
-                .order("created_at", desc=True) \
-                .limit(1) \
-                .execute()
+            # Served by idx_protests_account_created (migrations/010)
+            response = await self._run(
+                self.client.table("protests")
+                .select(fields)
+                .eq("account_number", account_number)
+                .order("created_at", desc=True)
+                .limit(1)
+            )
             return response.data[0] if response.data else None
         except Exception as e:
             logger.error(f"Error fetching protest for {account_number}: {e}")
@@ -63,57 +426,68 @@ class SupabaseService:
 
     async def save_equity_comps(self, protest_id: str, comps: list):
         if not self.client: return None
-        # Whitelist of known columns on equity_comparables — prevents PGRST204 on unknown fields
-        KNOWN_COLS = {
-            'protest_id', 'account_number', 'address', 'owner_name',
-            'distance', 'similarity', 'appraised_val', 'market_val',
-            'sqft', 'year_built', 'grade', 'cdu', 'adjustments',
-            'neighborhood_code', 'building_area', 'appraised_value',
-        }
-        for comp in comps:
-            comp['protest_id'] = protest_id
-            # Strip keys not in the DB schema
-            clean_comp = {}
-            for k, v in comp.items():
-                if k in KNOWN_COLS:
-                    # Serialize dict/list values to JSON string for JSONB or TEXT columns
-                    if isinstance(v, (dict, list)):
-                        clean_comp[k] = json.dumps(v)
-                    else:
-                        clean_comp[k] = v
+        # Strip keys not in the DB schema. Nested values (adjustments) go through as-is:
+        # the only structured column is JSONB, and pre-dumping them stored an escaped
+        # JSON string inside the request body instead of a JSON object.
+        clean_rows = [
+            {k: v for k, v in {**comp, "protest_id": protest_id}.items() if k in EQUITY_COMP_COLS}
+            for comp in comps
+        ]
+        if not clean_rows:
+            return
+        try:
+            # One bulk INSERT instead of one round-trip per comp
+            await self._run(self.client.table("equity_comparables").insert(clean_rows, returning="minimal"))
+            return
+        except Exception as e:
+            logger.warning(f"Bulk insert of {len(clean_rows)} equity comps failed, retrying per row: {e}")
+        # Fallback: a single bad row shouldn't lose the rest of the batch
+        for row in clean_rows:
             try:
-                self.client.table("equity_comparables").insert(clean_comp).execute()
+                await self._run(self.client.table("equity_comparables").insert(row, returning="minimal"))
             except Exception as e:
                 logger.error(f"Failed to insert equity comp: {e}")
 
+    async def _fetch_cached_comps_raw(self, account_number: str, ttl_days: int):
+        """Return the fresh `cached_comps` value as stored (JSON string or list), else None."""
+        # TTL is enforced server-side: stale rows never cross the wire
+        cutoff = _utc_cutoff(ttl_days)
+        cached_comps = await self._pg_value(
+            "SELECT cached_comps FROM properties WHERE account_number = $1 AND comps_scraped_at > $2 LIMIT 1",
+            account_number, cutoff,
+        )
+        if cached_comps is _PG_UNAVAILABLE:
+            response = await self._run(
+                self.client.table("properties")
+                .select("cached_comps")
+                .eq("account_number", account_number)
+                .gt("comps_scraped_at", cutoff.isoformat())
+                .limit(1)
+            )
+            cached_comps = response.data[0].get("cached_comps") if response.data else None
+        if not cached_comps:
+            logger.info(f"No fresh cached comps for {account_number} (TTL={ttl_days}d).")
+            return None
+        logger.info(f"Using cached comps for {account_number} (TTL={ttl_days}d).")
+        return cached_comps
+
     async def get_cached_comps(self, account_number: str, ttl_days: int = COMP_CACHE_TTL_DAYS):
         """
         Returns cached neighbor comps for an account if they exist and are fresh (within ttl_days).
         Returns None if no cache or cache is stale.
         """
         if not self.client: return None
+        key = (account_number, "cached_comps")
+        hit = self._mem_cache.get(key)
+        if hit is not None:
+            return copy.deepcopy(hit)
         try:
-            response = self.client.table("properties") \
-                .select("cached_comps, comps_scraped_at") \
-                .eq("account_number", account_number) \
-                .execute()
-            if not response.data:
-                return None
-            row = response.data[0]
-            cached_comps = row.get("cached_comps")
-            comps_scraped_at = row.get("comps_scraped_at")
-            if not cached_comps or not comps_scraped_at:
-                return None
-            # Check TTL
-            scraped_dt = datetime.fromisoformat(comps_scraped_at.replace("Z", "+00:00"))
-            age_days = (datetime.now(timezone.utc) - scraped_dt).days
-            if age_days > ttl_days:
-                logger.info(f"Cached comps for {account_number} are {age_days} days old (TTL={ttl_days}d) — treating as stale.")
-                return None
-            logger.info(f"Using cached comps for {account_number} (age: {age_days} days).")
+            cached_comps = await self._fetch_cached_comps_raw(account_number, ttl_days)
             # Deserialize JSON string if needed
             if isinstance(cached_comps, str):
-                cached_comps = json.loads(cached_comps)
+                cached_comps = _json_loads(cached_comps)
+            if cached_comps:
+                self._mem_cache[key] = copy.deepcopy(cached_comps)
             return cached_comps
         except Exception as e:
             logger.warning(f"get_cached_comps failed: {e}")
@@ -122,14 +496,22 @@ class SupabaseService:
     async def save_cached_comps(self, account_number: str, comps: list):
         """
         Saves neighbor comps as JSON to the properties table with a current timestamp.
+        Cache writes use Prefer: return=minimal — the default would echo the whole
+        properties row (every JSONB cache included) back just to be discarded.
         """
         if not self.client: return None
+        self._mem_cache.pop((account_number, "cached_comps"), None)
+        self._mem_cache.pop((account_number, "row"), None)
         try:
             update_data = {
-                "cached_comps": json.dumps(comps),
+                "cached_comps": _json_dumps(comps),
                 "comps_scraped_at": datetime.now(timezone.utc).isoformat(),
             }
-            self.client.table("properties").update(update_data).eq("account_number", account_number).execute()
+            await self._run(
+                self.client.table("properties")
+                .update(update_data, returning="minimal")
+                .eq("account_number", account_number)
+            )
             logger.info(f"Saved {len(comps)} comps to cache for {account_number}.")
         except Exception as e:
             logger.warning(f"save_cached_comps failed: {e}")
@@ -145,27 +527,18 @@ class SupabaseService:
         """
         if not self.client or not neighborhood_code:
             return []
-        # Handle all variations of the neighborhood code (e.g. 8401, 8401.00, 8401.01, 8014A)
-        base_code = str(neighborhood_code).split('.')[0].strip()
-        
-        # Build precise permutations to avoid expensive ILIKE table scans
-        code_variations = [base_code] 
-        code_variations += [f"{base_code}.{str(i).zfill(2)}" for i in range(20)] # .00 to .19
-        code_variations += [f"{base_code}{chr(i)}" for i in range(65, 91)] # A to Z
-        code_variations += [f"{base_code} {chr(i)}" for i in range(65, 91)] # With space
+        base_code, code_prefix, code_pattern = _nbhd_code_filters(neighborhood_code)
 
         try:
-            # Fetch with a larger limit to account for post-filtering
-            fetch_limit = limit * 2
-            
             query = (
                 self.client.table("properties")
                 .select("account_number,address,appraised_value,market_value,building_area,land_area,year_built,neighborhood_code,district,building_grade,building_quality,valuation_history,land_breakdown,last_sale_date,deed_count")
-                .in_("neighborhood_code", code_variations)
                 .eq("district", district)
+                .like("neighborhood_code", code_prefix)
+                .filter("neighborhood_code", "match", code_pattern)
                 .neq("account_number", account_number)
                 .gt("appraised_value", 0)
-                .limit(fetch_limit)
+                .limit(limit)
             )
 
             # Only apply building_area filter if we have a valid area
@@ -174,19 +547,10 @@ class SupabaseService:
                 max_area = int(building_area * (1 + tolerance))
                 query = query.gte("building_area", min_area).lte("building_area", max_area).gt("building_area", 0)
             
-            response = query.execute()
-            
-            raw_results = response.data or []
-            results = []
+            response = await self._run(query)
             
-            # Additional double check to make sure it matches the exact base logic
-            for r in raw_results:
-                c = str(r.get("neighborhood_code", "")).strip()
-                if c == base_code or c.startswith(f"{base_code}."):
-                    results.append(r)
-            
-            # Enforce the original limit
-            results = results[:limit]
+            # The regex filter and LIMIT are applied server-side — every row is usable as-is
+            results = response.data or []
             
             area_desc = f"area={building_area}±{int(tolerance*100)}%" if building_area else "no area filter"
             logger.info(f"DB neighbor lookup: {len(results)} comps for nbhd={base_code}(any decimal), {area_desc}")
@@ -195,60 +559,97 @@ class SupabaseService:
             logger.warning(f"get_neighbors_from_db failed: {e}")
             return []
 
+    async def find_equity_comps(self, account_number: str, neighborhood_code: str,
+                                building_area: int, district: str = "HCAD",
+                                tolerance: float = 0.35, limit: int = 20,
+                                min_db_comps: int = 3, use_cache: bool = True,
+                                ttl_days: int = COMP_CACHE_TTL_DAYS) -> tuple:
+        """
+        DB neighbors, or — when the DB has fewer than `min_db_comps` — the fresh
+        scraped-comp cache, in a single round-trip (migrations/013).
+        Returns (comps, source) where source is "db", "cache" or None.
+        Pass a falsy neighborhood_code to skip the DB lookup, use_cache=False to skip the cache.
+        """
+        if not self.client:
+            return [], None
+        has_area = bool(building_area) and int(building_area) > 0
+        params = {
+            "p_account_number": account_number,
+            "p_district": district,
+            "p_code_prefix": None,
+            "p_code_pattern": None,
+            "p_min_area": int(building_area * (1 - tolerance)) if has_area else None,
+            "p_max_area": int(building_area * (1 + tolerance)) if has_area else None,
+            "p_limit": limit,
+            "p_min_db_comps": min_db_comps,
+            "p_cache_cutoff": _utc_cutoff(ttl_days) if use_cache else None,
+        }
+        if neighborhood_code:
+            _, params["p_code_prefix"], params["p_code_pattern"] = _nbhd_code_filters(neighborhood_code)
+        try:
+            payload = await self._rpc_value("find_equity_comps", params) or {}
+            comps, source = payload.get("comps") or [], payload.get("source")
+            logger.info(f"find_equity_comps: {len(comps)} comps for {account_number} (source={source})")
+            return comps, source
+        except Exception as e:
+            logger.warning(f"find_equity_comps RPC failed, falling back to separate queries: {e}")
+
+        if neighborhood_code:
+            db_comps = await self.get_neighbors_from_db(account_number, neighborhood_code, building_area,
+                                                        district=district, tolerance=tolerance, limit=limit)
+            if len(db_comps) >= min_db_comps:
+                return db_comps, "db"
+        if use_cache:
+            cached = await self.get_cached_comps(account_number, ttl_days)
+            if cached:
+                return cached, "cache"
+        return [], None
+
     async def search_address_globally(self, address_query: str, limit: int = 5) -> list:
         """
         Search for properties by address across ALL districts.
         Useful when user input is ambiguous (e.g. "123 Main St" without City/Zip).
+        Results are ranked by trigram word similarity, best match first.
         """
         if not self.client or not address_query: return []
         
-        # Basic cleaning to help ILIKE match better
-        clean_q = "".join(c for c in address_query if c.isalnum() or c.isspace()).strip()
+        # Basic cleaning — pg_trgm ignores punctuation, but it still counts toward the length check
+        clean_q = address_query.translate(ADDR_PUNCT_TABLE).strip()
         if len(clean_q) < 4: return []
         
         try:
-            # Use ILIKE for case-insensitive partial match
-            response = self.client.table("properties") \
-                .select("account_number, address, district, appraised_value") \
-                .ilike("address", f"%{clean_q}%") \
-                .limit(limit) \
-                .execute()
-            if response.data:
-                return response.data
-
-            # Fallback: extract just the street part (before any comma/city)
-            # This handles cases where abbreviation expansion (Ln→Lane) or
-            # city suffix differences prevent the full query from matching
-            street_part = address_query.split(",")[0].strip()
-            clean_street = "".join(c for c in street_part if c.isalnum() or c.isspace()).strip()
-            if clean_street and clean_street != clean_q and len(clean_street) >= 4:
-                response = self.client.table("properties") \
-                    .select("account_number, address, district, appraised_value") \
-                    .ilike("address", f"%{clean_street}%") \
-                    .limit(limit) \
-                    .execute()
-                if response.data:
-                    return response.data
-
-            # Fallback 2: use just house number + first street word
-            # Handles "825 Town and Country Lane" vs "825 TOWN AND COUNTRY LN"
-            parts = clean_street.split() if clean_street else clean_q.split()
-            if len(parts) >= 2 and parts[0][0].isdigit():
-                # Use house number + first two words of street name
-                short_q = " ".join(parts[:min(3, len(parts))])
-                if short_q != clean_street and len(short_q) >= 4:
-                    response = self.client.table("properties") \
-                        .select("account_number, address, district, appraised_value") \
-                        .ilike("address", f"%{short_q}%") \
-                        .limit(limit) \
-                        .execute()
-                    if response.data:
-                        return response.data
-
-            return []
+            # One ranked fuzzy match (migrations/011) instead of full → street-only → short-prefix ILIKE retries
+            response = await self._run(self.client.rpc("search_properties_by_address", {
+                "p_query": clean_q,
+                "p_limit": limit,
+            }))
+            return response.data or []
         except Exception as e:
             logger.warning(f"search_address_globally failed: {e}")
             return []
+
+    async def resolve_property_by_address(self, address_query: str):
+        """
+        Full properties row for the best fuzzy match of a typed address, or None.
+        The resolve_property_by_address RPC (migrations/016) ranks like
+        search_address_globally and returns the row in the same round-trip.
+        """
+        if not self.client or not address_query: return None
+        clean_q = address_query.translate(ADDR_PUNCT_TABLE).strip()
+        if len(clean_q) < 4: return None
+        try:
+            row = await self._rpc_value("resolve_property_by_address", {"p_query": clean_q}) or None
+            if row and row.get("account_number"):
+                self._mem_cache[(row["account_number"], "row")] = copy.deepcopy(row)
+            return row
+        except Exception as e:
+            logger.warning(f"resolve_property_by_address RPC failed, falling back to separate queries: {e}")
+
+        candidates = await self.search_address_globally(address_query, limit=1)
+        if not candidates or not candidates[0].get('account_number'):
+            return None
+        return await self.get_property_by_account(candidates[0]['account_number'])
+
     # ── Generic field-level cache helpers ──────────────────────────────────
     #   These read/write JSON blobs + timestamps on the `properties` table.
     #   No schema migration needed — Supabase JSONB columns auto-create on upsert.
@@ -257,26 +658,28 @@ class SupabaseService:
         """Return cached JSON from `data_col` if `ts_col` is within TTL, else None."""
         if not self.client:
             return None
+        key = (account_number, data_col)
+        hit = self._mem_cache.get(key)
+        if hit is not None:
+            # Callers append to cached lists (e.g. vision detections) — never hand out the memo itself
+            return copy.deepcopy(hit)
         try:
-            response = self.client.table("properties") \
-                .select(f"{data_col}, {ts_col}") \
-                .eq("account_number", account_number) \
-                .execute()
-            if not response.data:
-                return None
-            row = response.data[0]
-            data = row.get(data_col)
-            ts = row.get(ts_col)
-            if not data or not ts:
-                return None
-            scraped_dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
-            age_days = (datetime.now(timezone.utc) - scraped_dt).days
-            if age_days > ttl_days:
-                logger.info(f"Cache stale for {account_number}.{data_col} ({age_days}d > {ttl_days}d TTL)")
+            # TTL is enforced server-side: stale rows never cross the wire
+            cutoff = _utc_cutoff(ttl_days).isoformat()
+            response = await self._run(
+                self.client.table("properties")
+                .select(data_col)
+                .eq("account_number", account_number)
+                .gt(ts_col, cutoff)
+                .limit(1)
+            )
+            data = response.data[0].get(data_col) if response.data else None
+            if not data:
                 return None
-            logger.info(f"Cache HIT for {account_number}.{data_col} (age: {age_days}d)")
-            if isinstance(data, str):
-                data = json.loads(data)
+            logger.info(f"Cache HIT for {account_number}.{data_col} (TTL={ttl_days}d)")
+            if isinstance(data, str):  # rows written before values were stored as native JSONB
+                data = _json_loads(data)
+            self._mem_cache[key] = copy.deepcopy(data)
             return data
         except Exception as e:
             logger.warning(f"_get_cached_field({data_col}) failed: {e}")
@@ -286,22 +689,67 @@ class SupabaseService:
         """Save a JSON blob + current timestamp to the properties table."""
         if not self.client:
             return
+        self._mem_cache.pop((account_number, data_col), None)
+        self._mem_cache.pop((account_number, "row"), None)
         try:
+            # Cache columns are JSONB (migrations/004): send the object and let the
+            # request body encode it once instead of storing a pre-dumped JSON string
             update_data = {
-                data_col: json.dumps(value) if isinstance(value, (dict, list)) else value,
+                data_col: value,
                 ts_col: datetime.now(timezone.utc).isoformat(),
             }
-            self.client.table("properties").update(update_data).eq("account_number", account_number).execute()
+            await self._run(
+                self.client.table("properties")
+                .update(update_data, returning="minimal")
+                .eq("account_number", account_number)
+            )
             logger.info(f"Cache SAVED for {account_number}.{data_col}")
         except Exception as e:
             logger.warning(f"_save_cached_field({data_col}) failed: {e}")
 
+    async def get_all_caches(self, account_number: str) -> dict:
+        """
+        Fetch every FIELD_CACHE_SPECS cache for one account in a single SELECT.
+        Returns {name: data or None}, applying each field's TTL in Python.
+        """
+        result = {name: None for name in FIELD_CACHE_SPECS}
+        if not self.client:
+            return result
+        cols = ",".join(f"{data_col},{ts_col}" for data_col, ts_col, _ in FIELD_CACHE_SPECS.values())
+        try:
+            response = await self._run(
+                self.client.table("properties")
+                .select(cols)
+                .eq("account_number", account_number)
+                .limit(1)
+            )
+            if not response.data:
+                return result
+            row = response.data[0]
+            now = datetime.now(timezone.utc)
+            for name, (data_col, ts_col, ttl_days) in FIELD_CACHE_SPECS.items():
+                data = row.get(data_col)
+                ts = row.get(ts_col)
+                if not data or not ts:
+                    continue
+                # Same boundary as the server-side .gt(ts_col, cutoff) used by _get_cached_field
+                if _parse_ts(ts) <= _utc_cutoff(ttl_days, now):
+                    continue
+                if isinstance(data, str):
+                    data = _json_loads(data)
+                self._mem_cache[(account_number, data_col)] = copy.deepcopy(data)
+                result[name] = data
+            logger.info(f"Cache warm for {account_number}: {[n for n, v in result.items() if v is not None]}")
+        except Exception as e:
+            logger.warning(f"get_all_caches failed for {account_number}: {e}")
+        return result
+
     # ── Sales Comp Cache (30-day TTL) ─────────────────────────────────────
     async def get_cached_sales(self, account_number: str):
-        return await self._get_cached_field(account_number, "sales_cache", "sales_fetched_at", 30)
+        return await self._get_cached_field(account_number, *FIELD_CACHE_SPECS["sales"])
 
     async def save_cached_sales(self, account_number: str, sales_data: list):
-        await self._save_cached_field(account_number, "sales_cache", "sales_fetched_at", sales_data)
+        await self._save_cached_field(account_number, *FIELD_CACHE_SPECS["sales"][:2], sales_data)
 
     async def save_sales_comparables(self, account_number: str, protest_id: str, comps: list):
         """
@@ -309,112 +757,42 @@ class SupabaseService:
         """
         if not self.client or not comps: return
         try:
-            # Delete any existing sales comps for this account to prevent duplicates
-            self.client.table("sales_comparables").delete().eq("account_number", account_number).execute()
+            records = [_sales_comp_record(account_number, protest_id, comp) for comp in comps]
             
-            records = []
-            for comp in comps:
-                # Ensure it's a dict
-                comp_dict = comp if isinstance(comp, dict) else comp.model_dump()
-                
-                address = comp_dict.get("Address") or comp_dict.get("address")
-                
-                sale_price_raw = comp_dict.get("Sale Price") or comp_dict.get("sale_price")
-                sale_price = None
-                if isinstance(sale_price_raw, str):
-                    sp_str = sale_price_raw.replace("$", "").replace(",", "").replace(" (est)", "").strip()
-                    try: sale_price = float(sp_str)
-                    except ValueError: pass
-                else:
-                    sale_price = sale_price_raw
-                
-                sale_date = comp_dict.get("Sale Date") or comp_dict.get("sale_date")
-                if isinstance(sale_date, str) and "(Loan)" in sale_date:
-                    sale_date = sale_date.replace(" (Loan)", "").strip()
-                if not sale_date or sale_date == "Unknown":
-                    sale_date = None
-                    
-                sqft_raw = comp_dict.get("SqFt") or comp_dict.get("sqft")
-                sqft = None
-                if isinstance(sqft_raw, str):
-                    sq_str = sqft_raw.replace(",", "").strip()
-                    if sq_str.isdigit(): sqft = int(sq_str)
-                else:
-                    sqft = sqft_raw
-                    
-                price_per_sqft_raw = comp_dict.get("Price/SqFt") or comp_dict.get("price_per_sqft")
-                price_per_sqft = None
-                if isinstance(price_per_sqft_raw, str):
-                    pps_str = price_per_sqft_raw.replace("$", "").replace(",", "").strip()
-                    try: price_per_sqft = float(pps_str)
-                    except ValueError: pass
-                else:
-                    price_per_sqft = price_per_sqft_raw
-                    
-                year_built = comp_dict.get("Year Built") or comp_dict.get("year_built")
-                if year_built == "N/A":
-                    year_built = None
-                    
-                dist_raw = comp_dict.get("Distance") or comp_dict.get("distance") or comp_dict.get("dist_from_subject")
-                dist = None
-                if isinstance(dist_raw, str):
-                    d_str = dist_raw.replace(" mi", "").strip()
-                    try: dist = float(d_str)
-                    except ValueError: pass
-                else:
-                    dist = dist_raw
-                    
-                prop_type = comp_dict.get("Type") or comp_dict.get("property_type")
-                if isinstance(prop_type, str) and "(Inferred)" in prop_type:
-                    prop_type = prop_type.replace(" (Inferred)", "").strip()
-
-                records.append({
-                    "account_number": account_number,
-                    "protest_id": protest_id,
-                    "address": address,
-                    "sale_price": sale_price,
-                    "sale_date": sale_date,
-                    "sqft": sqft,
-                    "price_per_sqft": price_per_sqft,
-                    "year_built": year_built,
-                    "source": comp_dict.get("Source") or comp_dict.get("source", "RentCast"),
-                    "dist_from_subject": dist,
-                    "similarity_score": comp_dict.get("similarity", comp_dict.get("similarity_score")),
-                    "property_type": prop_type
-                })
-            
-            if records:
-                result = self.client.table("sales_comparables").insert(records).execute()
-                # Supabase Python client returns a data object, errors usually raise exceptions. 
-                # But just in case, we check if it returned empty data when it shouldn't have.
-                if hasattr(result, 'data') and len(result.data) == len(records):
-                    logger.info(f"✅ Saved {len(records)} comp rows to sales_comparables for {account_number}.")
-                else:
-                    logger.warning(f"⚠️ sales_comparables insert returned unexpected result: {result}")
+            # Delete-then-insert runs server-side in one transaction (migrations/009)
+            # so a failure part-way never leaves the account with zero rows.
+            result = await self._run(self.client.rpc("replace_sales_comparables", {
+                "p_account_number": account_number,
+                "p_rows": records,
+            }))
+            if result.data == len(records):
+                logger.info(f"✅ Saved {len(records)} comp rows to sales_comparables for {account_number}.")
+            else:
+                logger.warning(f"⚠️ replace_sales_comparables returned unexpected result: {result}")
         except Exception as e:
             logger.error(f"❌ save_sales_comparables failed entirely: {e}")
 
 
     # ── FEMA Flood Zone Cache (365-day TTL) ───────────────────────────────
     async def get_cached_flood(self, account_number: str):
-        return await self._get_cached_field(account_number, "flood_cache", "flood_fetched_at", 365)
+        return await self._get_cached_field(account_number, *FIELD_CACHE_SPECS["flood"])
 
     async def save_cached_flood(self, account_number: str, flood_data: dict):
-        await self._save_cached_field(account_number, "flood_cache", "flood_fetched_at", flood_data)
+        await self._save_cached_field(account_number, *FIELD_CACHE_SPECS["flood"][:2], flood_data)
 
     # ── Vision Analysis Cache (90-day TTL) ────────────────────────────────
     async def get_cached_vision(self, account_number: str):
-        return await self._get_cached_field(account_number, "vision_cache", "vision_fetched_at", 90)
+        return await self._get_cached_field(account_number, *FIELD_CACHE_SPECS["vision"])
 
     async def save_cached_vision(self, account_number: str, vision_data):
-        await self._save_cached_field(account_number, "vision_cache", "vision_fetched_at", vision_data)
+        await self._save_cached_field(account_number, *FIELD_CACHE_SPECS["vision"][:2], vision_data)
 
     # ── Market Value Cache (30-day TTL) ───────────────────────────────────
     async def get_cached_market(self, account_number: str):
-        return await self._get_cached_field(account_number, "market_cache", "market_fetched_at", 30)
+        return await self._get_cached_field(account_number, *FIELD_CACHE_SPECS["market"])
 
     async def save_cached_market(self, account_number: str, market_data: dict):
-        await self._save_cached_field(account_number, "market_cache", "market_fetched_at", market_data)
+        await self._save_cached_field(account_number, *FIELD_CACHE_SPECS["market"][:2], market_data)
 
     # ── Deed Data Queries ─────────────────────────────────────────────────
     async def get_deed_history(self, account_number: str) -> list:
@@ -422,11 +800,13 @@ class SupabaseService:
         if not self.client:
             return []
         try:
-            response = self.client.table("property_deeds") \
-                .select("acct, date_of_sale, clerk_year, clerk_id, deed_id") \
-                .eq("acct", account_number) \
-                .order("date_of_sale", desc=True) \
-                .execute()
+            # Served by idx_deeds_acct_date (migrations/010)
+            response = await self._run(
+                self.client.table("property_deeds")
+                .select("acct, date_of_sale, clerk_year, clerk_id, deed_id")
+                .eq("acct", account_number)
+                .order("date_of_sale", desc=True)
+            )
             return response.data or []
         except Exception as e:
             logger.warning(f"get_deed_history failed for {account_number}: {e}")
@@ -435,23 +815,42 @@ class SupabaseService:
     async def get_last_sale_date(self, account_number: str) -> str:
         """
         Returns the most recent sale date for an account.
-        First checks properties.last_sale_date (fast), falls back to property_deeds query.
+        Reads properties.last_sale_date and, in the same request, the newest deed
+        as a fallback (embedded via migrations/012).
         """
         if not self.client:
             return None
+        if account_number in self._neg_last_sale:
+            return None
         try:
-            # Fast path: check materialized column
-            response = self.client.table("properties") \
-                .select("last_sale_date") \
-                .eq("account_number", account_number) \
-                .execute()
-            if response.data and response.data[0].get("last_sale_date"):
-                return response.data[0]["last_sale_date"]
-
-            # Slow path: query deed records directly
-            deeds = await self.get_deed_history(account_number)
-            if deeds:
-                return deeds[0].get("date_of_sale")
+            response = await self._run(
+                self.client.table("properties")
+                .select("last_sale_date, property_deeds(date_of_sale)")
+                .eq("account_number", account_number)
+                .order("date_of_sale", desc=True, foreign_table="property_deeds")
+                .limit(1, foreign_table="property_deeds")
+                .limit(1)
+            )
+            if response.data:
+                row = response.data[0]
+                if row.get("last_sale_date"):
+                    return row["last_sale_date"]
+                # Materialized column not populated yet — use the newest deed record
+                deeds = row.get("property_deeds") or []
+            else:
+                # The bulk deed import covers accounts with no properties row (migrations/012);
+                # the embed can't reach those, so ask property_deeds directly
+                deed_response = await self._run(
+                    self.client.table("property_deeds")
+                    .select("date_of_sale")
+                    .eq("acct", account_number)
+                    .order("date_of_sale", desc=True)
+                    .limit(1)
+                )
+                deeds = deed_response.data or []
+            if deeds and deeds[0].get("date_of_sale"):
+                return deeds[0]["date_of_sale"]
+            self._neg_last_sale[account_number] = True
             return None
         except Exception as e:
             logger.warning(f"get_last_sale_date failed for {account_number}: {e}")
@@ -1,6 +1,8 @@
 import logging
 import math
+from functools import lru_cache
 from typing import Dict, List, Optional
+import numpy as np
 from backend.db.supabase_client import supabase_service
 
 logger = logging.getLogger(__name__)
@@ -20,6 +22,11 @@ class VectorStore:
     MIN_YEAR = 1900.0
     MAX_YEAR = 2025.0
     MAX_LAND = 43560.0 * 5  # 5 acres
+
+    # Per-dimension weights (area, year, grade, land), baked into the stored vector so
+    # match_properties can rank with plain `<->` on the HNSW index. Changing them means
+    # re-running backend/scripts/backfill_embeddings.py over every row.
+    EMBEDDING_WEIGHTS = (2.0, 1.5, 1.0, 0.5)
     
     # Houston typical grade map to numeric for distance calculation
     GRADE_TO_NUM = {
@@ -29,10 +36,11 @@ class VectorStore:
         'B+': 0.55, 'B': 0.5, 'B-': 0.45,
         'C+': 0.4, 'C': 0.35, 'C-': 0.3,
         'D+': 0.25, 'D': 0.2, 'D-': 0.15,
-        'E': 0.1, 'F': 0.05
+        'F': 0.05
     }
 
-    def _normalize(self, value: float, min_val: float, max_val: float) -> float:
+    @staticmethod
+    def _normalize(value: float, min_val: float, max_val: float) -> float:
         """Min-max scaler bounded between 0 and 1."""
         if not value: return 0.0
         val = min(max(value, min_val), max_val)
@@ -40,32 +48,60 @@ class VectorStore:
 
     def compute_embedding(self, property_data: Dict) -> List[float]:
         """Convert a property dictionary into a 4-dimensional feature vector."""
-        
-        # 1. Building Area (weighted heavily)
-        area = float(property_data.get('building_area') or 0)
-        norm_area = self._normalize(area, 0, self.MAX_AREA) * 2.0  # 2x weight for size
-        
-        # 2. Year Built
-        year = float(property_data.get('year_built') or self.MIN_YEAR)
-        norm_year = self._normalize(year, self.MIN_YEAR, self.MAX_YEAR) * 1.5  # 1.5x weight for age
-        
-        # 3. Grade Numeric
-        grade_str = str(property_data.get('building_grade', 'C')).upper().strip()
-        norm_grade = self.GRADE_TO_NUM.get(grade_str, 0.35)  # Default to 'C' grade
-        
-        # 4. Land Area
-        land = float(property_data.get('land_area') or 0)
-        norm_land = self._normalize(land, 0, self.MAX_LAND) * 0.5  # 0.5x weight for lot size
-        
-        return [norm_area, norm_year, norm_grade, norm_land]
-
-    def update_property_embedding(self, account_number: str, property_data: Dict) -> bool:
-        """Compute and save the embedding for a property to Supabase."""
+        # Same four primitives → same vector; neighbors in a subdivision repeat them constantly
+        return list(_embedding_from_fields(*self._embedding_fields(property_data)))
+
+    def _embedding_fields(self, property_data: Dict) -> tuple:
+        """(area, year, grade, land) primitives the embedding is derived from — the memo key."""
+        return (
+            float(property_data.get('building_area') or 0),
+            float(property_data.get('year_built') or self.MIN_YEAR),
+            str(property_data.get('building_grade', 'C')).upper().strip(),
+            float(property_data.get('land_area') or 0),
+        )
+
+    def compute_embeddings_batch(self, props: List[Dict]) -> np.ndarray:
+        """
+        Vectorized compute_embedding over many properties: returns an (N, 4) array
+        whose rows match compute_embedding(props[i]).
+        """
+        n = len(props)
+        areas = np.fromiter((float(p.get('building_area') or 0) for p in props), dtype=np.float64, count=n)
+        years = np.fromiter((float(p.get('year_built') or self.MIN_YEAR) for p in props), dtype=np.float64, count=n)
+        lands = np.fromiter((float(p.get('land_area') or 0) for p in props), dtype=np.float64, count=n)
+        grade_map = self.GRADE_TO_NUM
+        grades = np.fromiter(
+            (grade_map.get(str(p.get('building_grade', 'C')).upper().strip(), 0.35) for p in props),
+            dtype=np.float64, count=n,
+        )
+
+        def normalize(values: np.ndarray, min_val: float, max_val: float) -> np.ndarray:
+            # Same rules as _normalize: falsy (0) stays 0, everything else is clipped then scaled
+            scaled = (np.clip(values, min_val, max_val) - min_val) / (max_val - min_val)
+            return np.where(values == 0, 0.0, scaled)
+
+        return np.column_stack([
+            normalize(areas, 0, self.MAX_AREA),
+            normalize(years, self.MIN_YEAR, self.MAX_YEAR),
+            grades,
+            normalize(lands, 0, self.MAX_LAND),
+        ]) * np.asarray(self.EMBEDDING_WEIGHTS)
+
+    @staticmethod
+    def to_pgvector(embedding) -> str:
+        """Format as pgvector array string: '[0.1,0.2,0.3,0.4]'"""
+        return f"[{','.join(f'{x:.4f}' for x in embedding)}]"
+
+    def update_property_embedding(self, account_number: str, property_data: Dict,
+                                  embedding: Optional[List[float]] = None) -> bool:
+        """
+        Compute and save the embedding for a property to Supabase.
+        Pass a precomputed `embedding` (e.g. a row of compute_embeddings_batch) to skip the computation.
+        """
         try:
-            embedding = self.compute_embedding(property_data)
-            
-            # Format as pgvector array string: '[0.1, 0.2, 0.3, 0.4]'
-            emb_str = f"[{','.join(f'{x:.4f}' for x in embedding)}]"
+            if embedding is None:
+                embedding = self.compute_embedding(property_data)
+            emb_str = self.to_pgvector(embedding)
             
             response = supabase_service.client.table("properties") \
                 .update({"embedding": emb_str}) \
@@ -77,6 +113,21 @@ class VectorStore:
             logger.error(f"Failed to update embedding for {account_number}: {e}")
             return False
 
+    def update_embeddings_bulk(self, pairs) -> int:
+        """
+        Save many (account_number, embedding) pairs in one round-trip (migrations/014).
+        Returns the number of properties updated.
+        """
+        rows = [{"account_number": acct, "embedding": self.to_pgvector(emb)} for acct, emb in pairs]
+        if not rows:
+            return 0
+        try:
+            response = supabase_service.client.rpc("update_property_embeddings", {"p_rows": rows}).execute()
+            return int(response.data or 0)
+        except Exception as e:
+            logger.error(f"Bulk embedding update failed for {len(rows)} properties: {e}")
+            return 0
+
     def find_similar_properties(self, subject: Dict, limit: int = 15) -> List[Dict]:
         """
         Query Supabase to find properties physically similar to the subject.
@@ -87,9 +138,8 @@ class VectorStore:
             return []
             
         try:
-            # 1. Calculate subject vector
-            subject_vec = self.compute_embedding(subject)
-            emb_str = f"[{','.join(f'{x:.4f}' for x in subject_vec)}]"
+            # 1. Calculate subject vector (memoized together with its pgvector literal)
+            emb_str = _pgvector_from_fields(*self._embedding_fields(subject))
             
             # Use RPC call for exact distance sorting, or just let Supabase match.
             # Fast raw SQL via Supabase RPC function (we need to create match_properties):
@@ -122,4 +172,30 @@ class VectorStore:
             logger.error(f"VectorStore: match_properties failed: {e}")
             return []
 
+@lru_cache(maxsize=4096)
+def _embedding_from_fields(area: float, year: float, grade_str: str, land: float) -> tuple:
+    """Pure core of VectorStore.compute_embedding, memoized on the extracted fields."""
+    normalize = VectorStore._normalize
+    cls = VectorStore
+    w_area, w_year, w_grade, w_land = cls.EMBEDDING_WEIGHTS
+
+    # 1. Building Area (weighted heavily)
+    norm_area = normalize(area, 0, cls.MAX_AREA) * w_area  # 2x weight for size
+
+    # 2. Year Built
+    norm_year = normalize(year, cls.MIN_YEAR, cls.MAX_YEAR) * w_year  # 1.5x weight for age
+
+    # 3. Grade Numeric
+    norm_grade = cls.GRADE_TO_NUM.get(grade_str, 0.35) * w_grade  # Default to 'C' grade
+
+    # 4. Land Area
+    norm_land = normalize(land, 0, cls.MAX_LAND) * w_land  # 0.5x weight for lot size
+
+    return (norm_area, norm_year, norm_grade, norm_land)
+
+@lru_cache(maxsize=1024)
+def _pgvector_from_fields(area: float, year: float, grade_str: str, land: float) -> str:
+    """pgvector literal for a subject's embedding; repeat searches skip the float formatting."""
+    return VectorStore.to_pgvector(_embedding_from_fields(area, year, grade_str, land))
+
 vector_store = VectorStore()
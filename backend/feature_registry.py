@@ -9,6 +9,15 @@ Add new features here and they will automatically appear in:
 Each feature has: name, category, description, status, and tier.
 """
 
+import json
+from collections import defaultdict
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 CATEGORIES = {
     "data": "DATA ACQUISITION & ENRICHMENT",
     "ai": "AI / MACHINE LEARNING ENGINE",
@@ -147,21 +156,46 @@ FEATURES = [
 ]
 
 
+# FEATURES is static — group it once at import instead of re-filtering on every call.
+# Tuples so the shared results can't be mutated by a caller.
+_LIVE_FEATURES = tuple(f for f in FEATURES if f["status"] == "live")
+_groups = defaultdict(list)
+for _f in _LIVE_FEATURES:
+    _groups[_f["category"]].append(_f)
+_BY_CATEGORY = {
+    cat_name: tuple(_groups[cat_key])
+    for cat_key, cat_name in CATEGORIES.items()
+    if _groups.get(cat_key)
+}
+del _groups, _f
+_INNOVATION_FEATURES = tuple(f for f in _LIVE_FEATURES if f["tier"] >= 2)
+
+_FEATURES_PAYLOAD = {
+    "categories": _BY_CATEGORY,
+    "live_count": len(_LIVE_FEATURES),
+    "innovations": _INNOVATION_FEATURES,
+}
+_FEATURES_JSON = (
+    orjson.dumps(_FEATURES_PAYLOAD) if HAS_ORJSON
+    else json.dumps(_FEATURES_PAYLOAD, separators=(",", ":")).encode()
+)
+
+
 def get_features_by_category():
     """Group features by category for display."""
-    result = {}
-    for cat_key, cat_name in CATEGORIES.items():
-        feats = [f for f in FEATURES if f["category"] == cat_key and f["status"] == "live"]
-        if feats:
-            result[cat_name] = feats
-    return result
+    return dict(_BY_CATEGORY)
 
 
 def get_live_count():
     """Count of live features."""
-    return len([f for f in FEATURES if f["status"] == "live"])
+    return len(_LIVE_FEATURES)
 
 
 def get_innovation_features():
     """Get tier 2+ features for the innovations section."""
-    return [f for f in FEATURES if f["tier"] >= 2 and f["status"] == "live"]
+    return _INNOVATION_FEATURES
+
+
+def get_features_json() -> bytes:
+    """Live catalog (categories, live count, innovations) as JSON bytes, serialized once at import."""
+    return _FEATURES_JSON
@@ -1,7 +1,8 @@
 from typing import Optional
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import StreamingResponse
-from dotenv import load_dotenv
+from fastapi import BackgroundTasks, FastAPI, Header, HTTPException
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import Response, StreamingResponse
+from backend.utils.env_utils import load_env
 import logging
 import sys
 import asyncio
@@ -10,6 +11,23 @@ import random
 import os
 import json
 import re
+import copy
+import secrets
+from contextlib import asynccontextmanager, suppress
+from functools import lru_cache
+from cachetools import TTLCache
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import uvloop
+    HAS_UVLOOP = sys.platform != 'win32'
+except ImportError:
+    HAS_UVLOOP = False
 
 logger = logging.getLogger(__name__)
 
@@ -17,8 +35,11 @@ logger = logging.getLogger(__name__)
 if sys.platform == 'win32':
     logging.info("Attempting to set ProactorEventLoopPolicy...")
     asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+elif HAS_UVLOOP:
+    # libuv-based loop: same asyncio API (subprocesses included, so Playwright works), less per-await overhead
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
-load_dotenv()
+load_env()
 
 from backend.agents.district_factory import DistrictConnectorFactory
 from backend.agents.non_disclosure_bridge import NonDisclosureBridge
@@ -32,14 +53,43 @@ from backend.agents.permit_agent import PermitAgent
 from backend.agents.commercial_enrichment_agent import CommercialEnrichmentAgent
 from backend.agents.anomaly_detector import AnomalyDetectorAgent
 from backend.agents.crime_agent import CrimeAgent
+from backend.agents.property_type_resolver import resolve_property_type, RENTCAST_COMMERCIAL
+from backend.services.geo_intelligence_service import (
+    enrich_comps_with_distance, check_external_obsolescence, geocode
+)
+from backend.services.condition_delta_service import enrich_comps_with_condition
+from backend.services.savings_estimator import SavingsEstimator
+from backend.agents.hcad_scraper import close_shared_browser
+from backend.utils.http_client import close_http_client
+from backend.feature_registry import get_features_json
 
 
 
 # Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+# LOG_LEVEL=WARNING in production drops the per-stage INFO chatter from the protest stream
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(),
+                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Texas Equity AI API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build every district connector up front so the first request per district doesn't pay for it
+    for code in WARM_DISTRICTS:
+        _connector_for(code)
+    # HCADScraper launches its shared Chromium lazily on first scrape, the API agents share
+    # one pooled HTTP client, and reads may hold a direct Postgres pool; close them on shutdown
+    yield
+    await close_shared_browser()
+    await close_http_client()
+    await supabase_service.close_pg_pool()
+
+app = FastAPI(title="Texas Equity AI API", lifespan=lifespan)
+# The final protest chunk (narrative + equity/vision structures) is tens of KB of JSON.
+# Streaming chunks are sync-flushed, so status lines still reach the client immediately.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# Generated Form 41.44 PDFs land here — create it once rather than on every request
+os.makedirs("outputs", exist_ok=True)
 
 # Initialize Agents
 # scraper = HCADScraper() # Replaced by factory in endpoint
@@ -55,14 +105,278 @@ permit_agent = PermitAgent()
 commercial_agent = CommercialEnrichmentAgent()
 anomaly_agent = AnomalyDetectorAgent()
 crime_agent = CrimeAgent()
+savings_estimator = SavingsEstimator(tax_rate=0.025)
+
+WARM_DISTRICTS = ("HCAD", "TCAD", "DCAD", "CCAD", "TAD")
+
+
+@lru_cache(maxsize=None)
+def _connector_for(district_code: str):
+    # Connectors are stateless apart from config and, for CCAD, an httpx connection pool —
+    # build one per district for the life of the process instead of one per request
+    return DistrictConnectorFactory.get_connector(district_code)
+
+
+def _get_connector(district: Optional[str], account_number: Optional[str] = None):
+    """Process-wide DistrictConnectorFactory.get_connector (same detection and HCAD default)."""
+    code = district or DistrictConnectorFactory.detect_district_from_account(account_number) or "HCAD"
+    return _connector_for(code.upper())
+
+
+# Scraped property details keyed by (district, account, address hint). CAD records change at
+# most daily, so a repeat request within the hour skips the Playwright scrape entirely.
+PROPERTY_DETAILS_TTL_SECONDS = 3600
+_property_details_cache = TTLCache(maxsize=4096, ttl=PROPERTY_DETAILS_TTL_SECONDS)
+
+
+async def _get_property_details_cached(connector, district: Optional[str], account_number: str,
+                                       address: Optional[str] = None,
+                                       cached_record: Optional[dict] = None) -> Optional[dict]:
+    """connector.get_property_details behind the TTL memo. Empty/stub results are not cached."""
+    key = (district, account_number, address)
+    hit = _property_details_cache.get(key)
+    if hit is not None:
+        # The pipeline mutates property_details in place — never hand out the memo itself
+        return copy.deepcopy(hit)
+    details = await connector.get_property_details(account_number, address=address, cached_record=cached_record)
+    if details and (details.get('appraised_value') or details.get('building_area')):
+        _property_details_cache[key] = copy.deepcopy(details)
+    return details
+
+
+# Finished /protest payloads keyed by (account, district). A repeat request inside the TTL
+# (refresh, double-click, second tab) replays the serialized result instead of the pipeline.
+# Requests with manual_* overrides are never cached.
+PROTEST_RESULT_TTL_SECONDS = 300
+_protest_result_cache = TTLCache(maxsize=256, ttl=PROTEST_RESULT_TTL_SECONDS)
+
+# Typed address -> (district, account_number, matched address) from the stage-0 DB search.
+# Account resolution doesn't change between requests, so repeats skip the trigram RPC.
+ADDRESS_RESOLUTION_TTL_SECONDS = 3600
+_address_resolution_cache = TTLCache(maxsize=50_000, ttl=ADDRESS_RESOLUTION_TTL_SECONDS)
+
+
+# Live neighbor deep-scrapes in flight at once (each is a browser context or API call);
+# connectors that can take more set MAX_CONCURRENCY
+NEIGHBOR_SCRAPE_CONCURRENCY = 6
+# Stop deep-scraping once this many usable neighbors are in hand — the equity stage needs five
+NEIGHBOR_SCRAPE_TARGET = 5
+
+# Form 41.44 renders run on worker threads after each stream closes. fpdf2 is CPU-bound,
+# so cap how many render at once instead of letting a burst of protests pile onto the GIL.
+PDF_RENDER_CONCURRENCY = 2
+_pdf_render_slots = asyncio.Semaphore(PDF_RENDER_CONCURRENCY)
+
+
+async def _render_form_41_44(property_details: dict, protest_data: dict, form_path: str):
+    async with _pdf_render_slots:
+        return await asyncio.to_thread(form_service.generate_form_41_44, property_details, protest_data, form_path)
+
+
+# no-cache / X-Accel-Buffering stop proxies (nginx, CDNs) from holding status lines back
+NDJSON_HEADERS = {
+    "X-Content-Type-Options": "nosniff",
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
+
+# A live scrape can go quiet for longer than a proxy's idle timeout
+STREAM_HEARTBEAT_SECONDS = 15
+
+
+async def _with_heartbeat(stream, interval: float = STREAM_HEARTBEAT_SECONDS):
+    """
+    Re-yield an NDJSON stream, emitting a blank line whenever a stage runs longer than
+    `interval`. NDJSON readers skip empty lines; proxies see traffic and keep the socket open.
+    """
+    pending = None
+    try:
+        while True:
+            pending = asyncio.ensure_future(stream.__anext__())
+            while not (await asyncio.wait({pending}, timeout=interval))[0]:
+                yield b"\n"
+            try:
+                line = pending.result()
+            except StopAsyncIteration:
+                return
+            yield line
+    finally:
+        # Client went away mid-stage: stop the stage before closing the generator
+        if pending is not None and not pending.done():
+            pending.cancel()
+            with suppress(asyncio.CancelledError, Exception):
+                await pending
+        await stream.aclose()
+
+
+class _ProtestBroadcast:
+    """
+    One in-flight protest pipeline, shared by every client asking for the same result key.
+    Lines are buffered as they are produced, so a late joiner replays what it missed
+    before following live. The pipeline is cancelled once the last client has gone;
+    a run that completes finishes its background work here, whoever is still listening.
+    """
+
+    def __init__(self):
+        self.lines = []
+        self.done = False
+        self.subscribers = 0
+        self.producer: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+
+    def _notify(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def pump(self, key, stream, finalize: Optional[BackgroundTasks] = None):
+        try:
+            async for line in stream:
+                self.lines.append(line)
+                self._notify()
+        finally:
+            await stream.aclose()
+            self.done = True
+            self._notify()
+            if _inflight_protests.get(key) is self:
+                del _inflight_protests[key]
+        # Saves and the form render belong to the run, not to the client that started it
+        if finalize is not None:
+            try:
+                await finalize()
+            except Exception as e:
+                logger.error(f"Protest finalize tasks failed: {e}")
+
+    async def subscribe(self):
+        self.subscribers += 1
+        try:
+            sent = 0
+            while True:
+                while sent < len(self.lines):
+                    yield self.lines[sent]
+                    sent += 1
+                if self.done:
+                    return
+                await self._changed.wait()
+        finally:
+            self.subscribers -= 1
+            if self.subscribers == 0 and not self.done and self.producer is not None and not self.producer.done():
+                self.producer.cancel()
+
+
+# Result key -> the pipeline currently producing it. Concurrent identical requests (double
+# submit, several tabs, a retry storm) share one run instead of scraping and billing twice.
+_inflight_protests: dict = {}
+
+
+def _dumps(value) -> bytes:
+    """JSON bytes for the NDJSON stream; orjson when available (the final payload is large)."""
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # something orjson rejects (e.g. an oversized int) — let the stdlib decide
+    return json.dumps(value).encode()
+
+
+def _ndjson(value) -> bytes:
+    """One NDJSON line."""
+    return _dumps(value) + b"\n"
+
+
+# Fixed progress lines, encoded once at import; only the f-string ones (counts,
+# percentiles) go through _ndjson per request.
+_STATUS = {key: _ndjson({"status": text}) for key, text in {
+    "resolve": "🔍 Resolver Agent: Locating property and resolving address...",
+    "profile": "🏢 Profiling property type...",
+    "commercial_fast_path": "🏢 Commercial Fast Path: Bypassing district scraper...",
+    "mine_commercial": "⛏️ Data Mining Agent: Retrieving commercial details from national databases...",
+    "mine": "⛏️ Data Mining Agent: Scraping HCAD records...",
+    "commercial_fallback": "🏢 Commercial Enrichment: Querying RealEstateAPI + RentCast for fallback data...",
+    "commercial_enrich": "🏢 Commercial Enrichment: Fetching real data from RealEstateAPI + RentCast...",
+    "market": "📊 Market Analyst: Querying RentCast for market values...",
+    "sales_cached": "💰 Sales Agent: Loaded recent sales comparables from cache...",
+    "sales": "💰 Sales Agent: Fetching recent sales comparables...",
+    "equity": "⚖️ Equity Specialist: Discovering comparable properties...",
+    "commercial_equity": "🏢 Commercial Equity: Building value pool from recent sales comparables...",
+    "equity_scrape": "⚖️ Equity Specialist: DB insufficient — scraping live neighbors...",
+    "anomaly": "📊 Anomaly Detector: Scoring property against neighborhood...",
+    "geo": "🌐 Geo-Intelligence: Computing distances and checking surroundings...",
+    "crime": "🚨 Intelligence Agent: Checking neighborhood crime activity for external obsolescence...",
+    "fast_mode": "⚡ Fast mode: Skipping vision and flood analysis (database record and comps are complete)...",
+    "vision": "📸 Vision Agent: Analyzing property condition...",
+    "vision_cached": "📸 Vision Agent: Using cached property condition analysis...",
+    "condition": "🔍 AI Condition Analyst: Comparing property conditions across comps...",
+    "condition_delta": "📸 Condition Delta: Comparing property condition against comps...",
+    "savings": "\u2728 Savings Estimator: Computing predicted savings range...",
+    "narrate": "✍️ Legal Narrator: Evaluating protest viability...",
+}.items()}
 
 
 
 @app.get("/")
-async def root():
+async def root() -> dict[str, str]:
     return {"message": "Texas Equity AI API is running"}
 
-from backend.utils.address_utils import normalize_address, is_real_address
+@app.post("/admin/cache/clear")
+async def clear_property_cache(x_admin_token: Optional[str] = Header(None)) -> dict[str, int]:
+    """Drop memoized scrape results, e.g. after a district publishes revised values."""
+    # Flushing forces fresh county-portal scrapes — only with ADMIN_TOKEN (disabled when unset)
+    admin_token = os.getenv("ADMIN_TOKEN")
+    if not admin_token or not x_admin_token or not secrets.compare_digest(x_admin_token.encode(), admin_token.encode()):
+        raise HTTPException(status_code=403, detail="Admin token required")
+    cleared = len(_property_details_cache)
+    _property_details_cache.clear()
+    # Cached protest payloads and address resolutions were built from those records
+    _protest_result_cache.clear()
+    _address_resolution_cache.clear()
+    return {"cleared": cleared}
+
+@app.get("/features")
+async def list_features():
+    """Live feature catalog for the dashboard/pitch deck — static, so served pre-serialized."""
+    return Response(content=get_features_json(), media_type="application/json")
+
+from backend.utils.address_utils import (
+    normalize_address, is_real_address, district_from_address, street_name_from_address, correct_district_city,
+)
+
+# County suffix appended to bare street addresses before geocoding
+DISTRICT_COUNTY_SUFFIX = {
+    "HCAD": ", Harris County, TX",
+    "TCAD": ", Travis County, TX",
+    "DCAD": ", Dallas County, TX",
+    "CCAD": ", Collin County, TX",
+    "TAD": ", Tarrant County, TX",
+    "BCAD": ", Brazoria County, TX",  # Safest generic fallback for a multi-city county
+}
+_STATE_OR_ZIP_RX = re.compile(r'(,\s*TX|\bTX\b|\bTexas\b|\d{5}(?:-\d{4})?$)', re.IGNORECASE)
+_ALPHA_RX = re.compile(r'[^\W\d_]')  # same set as str.isalpha(), scanned in C
+_STATE_CLASS_CODE_RX = re.compile(r'^([A-Z])\d?$')  # bare HCAD state class, e.g. "F1"
+
+
+def _is_ghost_record(p: dict) -> bool:
+    """
+    Returns True if a DB/scraper record contains known placeholder values or is an empty stub.
+    Ghost conditions:
+    1. Exact hardcoded mock: appraised=450000, area=2500, no year, no nbhd
+    2. Empty stub: appraised <= 1 and area <= 1 (scraper crashed but returned dict)
+    """
+    if not p:
+        return True
+    val  = float(p.get('appraised_value') or 0)
+    area = float(p.get('building_area') or 0)
+    has_year       = bool(p.get('year_built'))
+    has_nbhd       = bool(p.get('neighborhood_code'))
+
+    # 1. Check for explicit mock fallback
+    is_mock = (val == 450000.0 and area == 2500.0 and not has_year and not has_nbhd)
+    # 2. Check for empty stub
+    is_stub = (val <= 1.0 and area <= 1.0)
+    # 3. Incomplete record: missing BOTH neighborhood_code and building_area
+    #    (likely from RentCast or partial API — can't do equity analysis)
+    is_incomplete = (not has_nbhd and area <= 0)
+
+    return is_mock or is_stub or is_incomplete
 
 
 
@@ -72,7 +386,8 @@ async def get_full_protest(
     manual_address: Optional[str] = None,
     manual_value: Optional[float] = None,
     manual_area: Optional[float] = None,
-    district: Optional[str] = None
+    district: Optional[str] = None,
+    fast: bool = False
 ):
     loop = asyncio.get_running_loop()
     logger.info(f"Current Running Loop Type: {type(loop)}")
@@ -81,66 +396,69 @@ async def get_full_protest(
          # We can't actually change the running loop here, but we can log it.
          pass
 
-    def _is_ghost_record(p: dict) -> bool:
-        """
-        Returns True if a DB/scraper record contains known placeholder values or is an empty stub.
-        Ghost conditions:
-        1. Exact hardcoded mock: appraised=450000, area=2500, no year, no nbhd
-        2. Empty stub: appraised <= 1 and area <= 1 (scraper crashed but returned dict)
-        """
-        if not p:
-            return True
-        val  = float(p.get('appraised_value') or 0)
-        area = float(p.get('building_area') or 0)
-        has_year       = bool(p.get('year_built'))
-        has_nbhd       = bool(p.get('neighborhood_code'))
-        
-        # 1. Check for explicit mock fallback
-        is_mock = (val == 450000.0 and area == 2500.0 and not has_year and not has_nbhd)
-        # 2. Check for empty stub
-        is_stub = (val <= 1.0 and area <= 1.0)
-        # 3. Incomplete record: missing BOTH neighborhood_code and building_area
-        #    (likely from RentCast or partial API — can't do equity analysis)
-        is_incomplete = (not has_nbhd and area <= 0)
-        
-        return is_mock or is_stub or is_incomplete
-            
+    result_key = None
+    if manual_address is None and manual_value is None and manual_area is None:
+        result_key = (account_number.strip(), (district or "").upper(), fast)
+        cached_result = _protest_result_cache.get(result_key)
+        if cached_result is not None:
+            logger.info(f"Protest result cache hit for {account_number}")
+            return StreamingResponse(iter([b'{"data":' + cached_result + b',"cached":true}\n']),
+                                     media_type="application/x-ndjson", headers=NDJSON_HEADERS)
+        in_flight = _inflight_protests.get(result_key)
+        if in_flight is not None:
+            logger.info(f"Joining in-flight protest pipeline for {account_number}")
+            return StreamingResponse(_with_heartbeat(in_flight.subscribe()), media_type="application/x-ndjson",
+                                     headers=NDJSON_HEADERS)
+
+    # Filled by the generator once the narrative exists; run after the stream ends — by the
+    # shared pipeline when there is one, otherwise by Starlette once the response is sent
+    finalize_tasks = BackgroundTasks()
+
     async def protest_generator():
-        print("DEBUG: protest_generator STARTED!")
-        import asyncio
-        from starlette.requests import ClientDisconnect
-        
+        logger.debug("protest_generator started")
+        commercial_enrich_task = None  # enrichment started early when RentCast already says commercial
+        vision_inputs_task = None  # geocode/FEMA/Street View, started once the address is resolved
+
         try:
             equity_results = {} # Global initialization to prevent NameError
-            yield json.dumps({"status": "🔍 Resolver Agent: Locating property and resolving address..."}) + "\n"
+            yield _STATUS["resolve"]
             
             # 0. Fast DB Address Resolution (Cost-saving optimization)
             current_account = account_number
             current_district = district
             rentcast_fallback_data = None
             resolved_from_db = False
+            address_db_row = None  # properties row fetched by the stage-0 address match
+            db_first_hit = False  # property_details came straight from a complete DB record
+            skip_enrichment = False  # fast=true short-circuit, decided after the equity stage
 
             # Heuristic: If input has spaces and letters, treat as address
-            is_address_input = any(c.isalpha() for c in current_account) and " " in current_account
+            input_has_alpha = bool(_ALPHA_RX.search(account_number))
+            is_address_input = input_has_alpha and " " in account_number
 
             if is_address_input:
                 logger.info(f"Input '{current_account}' detected as address. Searching local database first...")
                 try:
-                    candidates = await supabase_service.search_address_globally(current_account)
-                    if candidates:
-                        best = candidates[0]
+                    address_key = " ".join(current_account.lower().split())
+                    match = _address_resolution_cache.get(address_key)
+                    if match is None:
+                        # Search + full row in one round-trip; stage 0c reuses the row
+                        best = await supabase_service.resolve_property_by_address(current_account) or {}
                         if best.get('district') and best.get('account_number'):
-                            new_dist = best['district']
-                            new_acc = best['account_number']
-                            logger.info(f"Global Address Match (DB): '{current_account}' -> {new_dist} Account #{new_acc} ({best['address']})")
-                            
-                            if new_dist != current_district:
-                                logger.info(f"Address-Correcting district from {current_district} to {new_dist}")
-                                current_district = new_dist
-                            
-                            # CRITICAL: Switch to the real account number!
-                            current_account = new_acc
-                            resolved_from_db = True
+                            match = (best['district'], best['account_number'], best.get('address'))
+                            _address_resolution_cache[address_key] = match
+                            address_db_row = best
+                    if match:
+                        new_dist, new_acc, matched_address = match
+                        logger.info(f"Global Address Match (DB): '{current_account}' -> {new_dist} Account #{new_acc} ({matched_address})")
+
+                        if new_dist != current_district:
+                            logger.info(f"Address-Correcting district from {current_district} to {new_dist}")
+                            current_district = new_dist
+
+                        # CRITICAL: Switch to the real account number!
+                        current_account = new_acc
+                        resolved_from_db = True
                 except Exception as e:
                     logger.warning(f"Global Address Lookup (DB) failed: {e}")
 
@@ -156,11 +474,16 @@ async def get_full_protest(
                     # Only switch current_account if we got a real assessorID back
                     if resolved_account:
                         current_account = resolved_account
-                        yield json.dumps({"status": f"✅ Resolver [RentCast]: Found account ID {current_account} (confidence 100%)"}) + "\n"
+                        yield _ndjson({"status": f"✅ Resolver [RentCast]: Found account ID {current_account} (confidence 100%)"})
                         logger.info(f"Resolved address to account: {current_account} via RentCast")
                     else:
                         logger.info(f"RentCast resolve returned no assessorID — keeping original input as account key.")
 
+                    # RentCast's own type says commercial: the fast path below will almost surely want
+                    # enrichment, so start it now and overlap it with the DB and type checks
+                    if resolved_ptype in RENTCAST_COMMERCIAL and not manual_value and not manual_address:
+                        commercial_enrich_task = asyncio.create_task(commercial_agent.enrich_property(account_number))
+
                     # Only use as fallback data if it's NOT a confirmed residential with no assessorID
                     if resolved_account or not is_residential_resolve:
                         rentcast_fallback_data = resolved
@@ -169,13 +492,7 @@ async def get_full_protest(
 
                     # Infer district from resolved address to ensure correct connector usage
                     if not current_district:
-                        res_addr = resolved.get('address', '').lower()
-                        if any(c in res_addr for c in ["plano", "frisco", "mckinney", "allen", "wylie", "prosper"]): current_district = "CCAD"
-                        elif any(c in res_addr for c in ["dallas", "irving", "garland", "richardson", "mesquite", "carrollton"]): current_district = "DCAD"
-                        elif any(c in res_addr for c in ["austin", "pflugerville", "lakeway", "manor", "bee cave"]): current_district = "TCAD"
-                        elif any(c in res_addr for c in ["fort worth", "arlington", "euless", "bedford", "keller", "southlake", "grapevine"]): current_district = "TAD"
-                        elif any(bc in res_addr for bc in ["brazoria", "pearland", "angleton", "alvin", "freeport", "lake jackson", "manvel"]): current_district = "BCAD"
-                        elif any(hc in res_addr for hc in ["houston", "harris", "katy", "cypress", "spring", "tomball", "humble"]): current_district = "HCAD"
+                        current_district = district_from_address(resolved.get('address', ''))
                         if current_district:
                             logger.info(f"Inferred district from RentCast address: {current_district}")
 
@@ -189,9 +506,14 @@ async def get_full_protest(
             # 0c. Global DB Lookup (Layer 2) — PROOF OF LIFE
             # If the user selected a district but the account exists in another known district in our DB, trust the DB.
             db_record = None
+            known_db_row = None  # db_record, or {} once the lookup has confirmed there is no row
             try:
                 # We use get_property_by_account which is district-agnostic (by account_number PK)
-                db_record = await supabase_service.get_property_by_account(current_account)
+                if address_db_row and address_db_row.get('account_number') == current_account:
+                    db_record = address_db_row
+                else:
+                    db_record = await supabase_service.get_property_by_account(current_account)
+                known_db_row = db_record or {}
                 if db_record and db_record.get('district'):
                     db_dist = db_record.get('district')
                     if db_dist != current_district:
@@ -202,19 +524,21 @@ async def get_full_protest(
 
 
             # 0e. Early Property Type Detection
-            yield json.dumps({"status": "🏢 Profiling property type..."}) + "\n"
-            from backend.agents.property_type_resolver import resolve_property_type
-            original_address = account_number if any(c.isalpha() for c in account_number) else None
+            yield _STATUS["profile"]
+            original_address = account_number if input_has_alpha else None
             lookup_addr = original_address or account_number
-            ptype, ptype_source = await resolve_property_type(current_account, lookup_addr, current_district or "HCAD", cached_property=db_record)
+            ptype, ptype_source = await resolve_property_type(current_account, lookup_addr, current_district or "HCAD", cached_property=known_db_row)
             logger.info(f"Early Type Detection: '{ptype}' via {ptype_source}")
+            if commercial_enrich_task and ptype != "Commercial":
+                commercial_enrich_task.cancel()  # DB record overruled RentCast's type
+                commercial_enrich_task = None
             
             # --- COMMERCIAL FAST PATH ---
             # If we explicitly know it's commercial, bypass the district scraper entirely and go to enrichment.
             fast_commercial_property = None
             if ptype == "Commercial" and not manual_value and not manual_address:
-                yield json.dumps({"status": "🏢 Commercial Fast Path: Bypassing district scraper..."}) + "\n"
-                enriched = await commercial_agent.enrich_property(lookup_addr)
+                yield _STATUS["commercial_fast_path"]
+                enriched = await (commercial_enrich_task or commercial_agent.enrich_property(lookup_addr))
                 if enriched and (enriched.get('appraised_value', 0) > 0 or enriched.get('building_area', 0) > 0):
                     fast_commercial_property = {
                         "account_number": current_account,
@@ -229,20 +553,21 @@ async def get_full_protest(
                 property_details = fast_commercial_property
                 # Skip scraper block
                 # Log to the user that we are using the enrichment API instead of the district site
-                yield json.dumps({"status": "⛏️ Data Mining Agent: Retrieving commercial details from national databases..."}) + "\n"
+                yield _STATUS["mine_commercial"]
                 
                 # Still need some empty assignment for the below block to not break
-                connector = DistrictConnectorFactory.get_connector(current_district or "HCAD", current_account)
+                connector = _get_connector(current_district or "HCAD", current_account)
                 original_address = lookup_addr
             else:
-                yield json.dumps({"status": "⛏️ Data Mining Agent: Scraping HCAD records..."}) + "\n"
+                yield _STATUS["mine"]
                 
                 # 1. Cache & Scrape — DB-first for ALL districts
-                cached_property = await supabase_service.get_property_by_account(current_account)
+                # Reuse the row fetched by the global DB lookup (0c) — same account, no second round-trip
+                cached_property = db_record
 
                 # Use Factory to get the correct connector
-                connector = DistrictConnectorFactory.get_connector(current_district, current_account)
-                original_address = account_number if any(c.isalpha() for c in account_number) else None
+                connector = _get_connector(current_district, current_account)
+                original_address = account_number if input_has_alpha else None
                 
                 # Use cached data directly if it has REAL content — skip scraper entirely
                 # Ghost/placeholder records (appraised=450k, area=2500, no year/nbhd) are rejected
@@ -262,10 +587,15 @@ async def get_full_protest(
                         and not manual_value and not manual_address):
                     logger.info(f"DB-first: Using Supabase cached record for {current_account} — skipping scraper.")
                     property_details = cached_property
+                    db_first_hit = True
                 else:
                     # Scrape if cache was insufficient
                     try:
-                        property_details = await connector.get_property_details(current_account, address=original_address)
+                        # Connectors' own Supabase-first step reuses the 0c row instead of re-querying
+                        property_details = await _get_property_details_cached(
+                            connector, current_district, current_account,
+                            address=original_address, cached_record=known_db_row,
+                        )
                     except Exception as e:
                         logger.error(f"Scraper failed for {current_account}: {e}")
                         property_details = None
@@ -283,20 +613,14 @@ async def get_full_protest(
                         current_account = scraped_acc
 
                 if not property_details:
-                    # District-aware City Mapping (Only used if RentCast falsely returns Houston for another county)
-                    district_map = {
-                        "HCAD": "Houston, TX", "TCAD": "Austin, TX", "DCAD": "Dallas, TX",
-                        "CCAD": "Plano, TX", "TAD": "Fort Worth, TX"
-                        # Note: Multi-city counties like BCAD are excluded so we don't accidentally override Pearland to Angleton
-                    }
-                    district_city = district_map.get(current_district, "Houston, TX")
-
                     # If scraper failed but we have a valid cache, use cache + rentcast enrichment
                     if cached_property and not _is_ghost_record(cached_property):
+                        # District-aware city fix (RentCast falsely returns Houston for other counties)
                         cached_addr = cached_property.get('address', '')
-                        if current_district and current_district != "HCAD" and "Houston" in cached_addr and district_city not in cached_addr:
+                        fixed_addr = correct_district_city(cached_addr, current_district)
+                        if fixed_addr != cached_addr:
                              logger.info(f"Correcting cached address city for {current_district}: {cached_addr}")
-                             cached_property['address'] = cached_addr.replace("Houston, TX", district_city)
+                             cached_property['address'] = fixed_addr
                         property_details = cached_property
                         logger.info("Using cached DB record over RentCast fallback to preserve neighborhood code.")
                     elif rentcast_fallback_data:
@@ -310,7 +634,7 @@ async def get_full_protest(
 
                             # SOFT GATE: Always attempt API enrichment regardless of propertyType.
                             # Only hard-fail if enrichment also comes back empty AND type is confirmed residential.
-                            yield json.dumps({"status": "🏢 Commercial Enrichment: Querying RealEstateAPI + RentCast for fallback data..."}) + "\n"
+                            yield _STATUS["commercial_fallback"]
                             enriched = await commercial_agent.enrich_property(lookup_addr)
                             if enriched and (enriched.get('appraised_value', 0) > 0 or enriched.get('building_area', 0) > 0):
                                 property_details = {
@@ -323,11 +647,11 @@ async def get_full_protest(
                             elif is_confirmed_residential:
                                 # Enrichment failed AND confirmed residential — genuine miss
                                 logger.error(f"Confirmed Residential miss for account {current_account} — district scraper returned nothing and enrichment failed.")
-                                yield json.dumps({"error": f"Could not retrieve property details for account '{current_account}' from the appraisal district portal. Please verify the account number or use the Manual Override fields to enter values directly."}) + "\n"
+                                yield _ndjson({"error": f"Could not retrieve property details for account '{current_account}' from the appraisal district portal. Please verify the account number or use the Manual Override fields to enter values directly."})
                                 return
                             else:
                                 logger.error(f"Commercial enrichment returned no usable data for '{lookup_addr}'.")
-                                yield json.dumps({"error": f"Could not retrieve property data for '{lookup_addr}'. This appears to be a commercial or non-standard property not accessible via public appraisal records or our API partners. Try the Manual Override fields to enter values directly."}) + "\n"
+                                yield _ndjson({"error": f"Could not retrieve property data for '{lookup_addr}'. This appears to be a commercial or non-standard property not accessible via public appraisal records or our API partners. Try the Manual Override fields to enter values directly."})
                                 return
             
             # AGGRESSIVE CLEANING
@@ -353,7 +677,7 @@ async def get_full_protest(
                 is_confirmed_residential = ptype == "Residential"
 
                 if not is_confirmed_residential:
-                    yield json.dumps({"status": "🏢 Commercial Enrichment: Fetching real data from RealEstateAPI + RentCast..."}) + "\n"
+                    yield _STATUS["commercial_enrich"]
                     enriched = await commercial_agent.enrich_property(lookup_addr)
                     if enriched and (enriched.get('appraised_value', 0) > 0 or enriched.get('building_area', 0) > 0):
                         property_details = {
@@ -367,6 +691,7 @@ async def get_full_protest(
                         # Don't abort — continue with whatever we have (manual override might save it)
 
             # Update cache
+            property_row_id = None
             if property_details and is_real_address(property_details.get('address')):
                 try:
                     clean_prop = {
@@ -384,7 +709,10 @@ async def get_full_protest(
                     # Filter out None values to never overwrite good existing data with blanks
                     clean_prop = {k: v for k, v in clean_prop.items() if v is not None}
                     if clean_prop.get("account_number"):
-                        await supabase_service.upsert_property(clean_prop)
+                        # Echo back only the row id — the final protest save needs it
+                        upserted = await supabase_service.upsert_property(clean_prop, returning="id")
+                        if upserted and clean_prop["account_number"] == current_account:
+                            property_row_id = upserted.get("id")
                 except: pass
 
             # Enrich property_details with owner/legal info from API sources
@@ -402,13 +730,56 @@ async def get_full_protest(
                         property_details[k] = v
                         logger.info(f"Enriched property_details['{k}'] from RentCast/API fallback")
 
-            yield json.dumps({"status": "📊 Market Analyst: Querying RentCast for market values..."}) + "\n"
+            # 5a. Vision inputs (geocode → FEMA flood zone + Street View download) depend only on
+            # the resolved address — start them now so they overlap market, sales and equity analysis
+            async def fetch_vision_inputs():
+                search_address = property_details.get('address', '')
+                district_key = property_details.get('district', 'HCAD')
+
+                # Smart Append: Check if address already appears to have a city/state/zip
+                has_state_or_zip = _STATE_OR_ZIP_RX.search(search_address)
+                has_comma = ',' in search_address
+
+                if not has_state_or_zip and not has_comma:
+                     search_address += DISTRICT_COUNTY_SUFFIX.get(district_key, ", TX")
+
+                # Geocode once for both Vision and FEMA
+                coords = await asyncio.to_thread(vision_agent._geocode_address, search_address)
+
+                # FEMA Check
+                async def fetch_flood_data():
+                    if not coords:
+                        return None
+                    if caches["flood"]:
+                        return caches["flood"]
+                    flood_data = await fema_agent.get_flood_zone(coords['lat'], coords['lng'])
+                    if flood_data:
+                        await supabase_service.save_cached_flood(current_account, flood_data)
+                    return flood_data
+
+                # FEMA lookup and Street View acquisition (cleaned search_address) don't depend on each other
+                return await asyncio.gather(
+                    fetch_flood_data(),
+                    vision_agent.get_street_view_images(search_address),
+                )
+
+            # One SELECT for the sales/flood/vision caches read by the stages below
+            caches = await supabase_service.get_all_caches(current_account)
+
+            # fast=true with a complete DB record may skip the vision stage entirely — hold the
+            # calls back until the skip decision below rather than spend them speculatively
+            if not (fast and db_first_hit and property_details.get('appraised_value')):
+                vision_inputs_task = asyncio.create_task(fetch_vision_inputs())
+
+            yield _STATUS["market"]
             
             # 3. Market Data
-            market_value = property_details.get('appraised_value', 0)
             prop_address = property_details.get('address', '')
-            
-            if is_real_address(prop_address):
+
+            async def fetch_market_value():
+                market_value = property_details.get('appraised_value', 0)
+                if not is_real_address(prop_address):
+                    return market_value
                 try:
                     market_data = None
                     if rentcast_fallback_data:
@@ -431,40 +802,51 @@ async def get_full_protest(
                 except:
                     if not market_value or market_value == 0:
                         market_value = property_details.get('appraised_value', 0)
-            
+                return market_value
+
             # 3b. Permit Analysis (Subject Property)
-            subject_permits = []
-            if is_real_address(prop_address):
-                subject_permits = await permit_agent.get_property_permits(prop_address)
-            permit_summary = permit_agent.analyze_permits(subject_permits)
-            property_details['permit_summary'] = permit_summary
+            async def fetch_subject_permits():
+                if not is_real_address(prop_address):
+                    return []
+                return await permit_agent.get_property_permits(prop_address)
 
             # 4. Sales Comparison Analysis (Independent of Equity)
-            print("DEBUG: Executing Sales Analysis Block in Main...")
-            
-            cached_sales = await supabase_service.get_cached_sales(current_account)
-            sales_results = None
-            
-            if cached_sales:
-                yield json.dumps({"status": "💰 Sales Agent: Loaded recent sales comparables from cache..."}) + "\n"
-                logger.info(f"Main: Loaded {len(cached_sales)} sales comps from cache.")
-                sales_results = {
-                    "sales_comps": cached_sales,
-                    "sales_count": len(cached_sales)
-                }
-            else:
-                yield json.dumps({"status": "💰 Sales Agent: Fetching recent sales comparables..."}) + "\n"
+            async def fetch_sales():
+                cached_sales = caches["sales"]
+                if cached_sales:
+                    logger.info(f"Main: Loaded {len(cached_sales)} sales comps from cache.")
+                    return {"sales_comps": cached_sales, "sales_count": len(cached_sales)}, True
                 logger.info("Main: Calling get_sales_analysis...")
                 try:
-                    sales_results = equity_engine.get_sales_analysis(property_details)
-                    print(f"DEBUG: get_sales_analysis result type: {type(sales_results)}")
-                    
+                    sales_results = await asyncio.to_thread(equity_engine.get_sales_analysis, property_details)
                     if sales_results and sales_results.get('sales_comps'):
                         await supabase_service.save_cached_sales(current_account, sales_results.get('sales_comps', []))
+                    return sales_results, False
                 except Exception as e:
-                    print(f"DEBUG: get_sales_analysis CRASHED: {e}")
-                    sales_results = None
-                
+                    logger.warning(f"get_sales_analysis failed: {e}")
+                    return None, False
+
+            # Market data, permits and sales comps are independent network calls — overlap them
+            sales_outcome, market_value, subject_permits = await asyncio.gather(
+                fetch_sales(),
+                fetch_market_value(),
+                fetch_subject_permits(),
+                return_exceptions=True,
+            )
+            if isinstance(market_value, Exception):
+                logger.warning(f"Market value lookup failed: {market_value}")
+                market_value = property_details.get('appraised_value', 0)
+            if isinstance(subject_permits, Exception):
+                logger.warning(f"Subject permit lookup failed: {subject_permits}")
+                subject_permits = []
+            permit_summary = permit_agent.analyze_permits(subject_permits)
+            property_details['permit_summary'] = permit_summary
+
+            if isinstance(sales_outcome, Exception):
+                logger.warning(f"Sales comparables lookup failed: {sales_outcome}")
+                sales_outcome = (None, False)
+            sales_results, sales_from_cache = sales_outcome
+            yield _STATUS["sales_cached"] if sales_from_cache else _STATUS["sales"]
 
             if sales_results:
                 count = sales_results.get('sales_count', 0)
@@ -474,7 +856,7 @@ async def get_full_protest(
             else:
                 logger.warning("Main: get_sales_analysis returned None.")
 
-            yield json.dumps({"status": "⚖️ Equity Specialist: Discovering comparable properties..."}) + "\n"
+            yield _STATUS["equity"]
 
             # 4. Equity Analysis — DB-first for ALL districts
             try:
@@ -506,8 +888,7 @@ async def get_full_protest(
                     # A=residential, B=mobile home, C=vacant, D=farm, E=exempt,
                     # F=commercial, G=oil/gas, H=commercial, J=utilities, K=commercial
                     COMMERCIAL_CODE_PREFIXES = ('F', 'G', 'H', 'J', 'K', 'L', 'X')
-                    import re as _re
-                    m = _re.match(r'^([A-Z])\d?$', pt.upper())
+                    m = _STATE_CLASS_CODE_RX.match(pt.upper())
                     if m and m.group(1) in COMMERCIAL_CODE_PREFIXES:
                         return True
 
@@ -530,30 +911,25 @@ async def get_full_protest(
 
                 # ── Commercial properties: DB-first then API comp pool ──────────
                 if is_commercial_prop:
-                    # Layer 0: DB neighbors first (fastest, cheapest — same as residential)
-                    if nbhd_code:
-                        db_comps = await supabase_service.get_neighbors_from_db(
-                            current_account, nbhd_code, bld_area, district=prop_district
-                        )
-                        if len(db_comps) >= 3:
-                            real_neighborhood = db_comps
-                            yield json.dumps({"status": f"⚖️ Equity Specialist: Found {len(real_neighborhood)} commercial comps from database instantly."}) + "\n"
-                            logger.info(f"Commercial DB-first: {len(real_neighborhood)} comps from nbhd={nbhd_code}")
-
-                    # Layer 0b: Cached comps
-                    if not real_neighborhood:
-                        cached_comps_comm = await supabase_service.get_cached_comps(current_account)
-                        if cached_comps_comm:
-                            real_neighborhood = cached_comps_comm
-                            yield json.dumps({"status": f"⚖️ Equity Specialist: Using {len(real_neighborhood)} cached commercial comps."}) + "\n"
+                    # Layer 0: DB neighbors first (fastest, cheapest — same as residential),
+                    # Layer 0b: cached comps — both resolved in one round-trip
+                    comps, comps_source = await supabase_service.find_equity_comps(
+                        current_account, nbhd_code, bld_area, district=prop_district
+                    )
+                    if comps_source == "db":
+                        real_neighborhood = comps
+                        yield _ndjson({"status": f"⚖️ Equity Specialist: Found {len(real_neighborhood)} commercial comps from database instantly."})
+                        logger.info(f"Commercial DB-first: {len(real_neighborhood)} comps from nbhd={nbhd_code}")
+                    elif comps_source == "cache":
+                        real_neighborhood = comps
+                        yield _ndjson({"status": f"⚖️ Equity Specialist: Using {len(real_neighborhood)} cached commercial comps."})
 
                     # Layer 1: API-based sales comp pool (fallback)
                     if not real_neighborhood:
                         try:
-                            from backend.agents.commercial_enrichment_agent import CommercialEnrichmentAgent
-                            comm_agent_local = CommercialEnrichmentAgent()
-                            yield json.dumps({"status": "🏢 Commercial Equity: Building value pool from recent sales comparables..."}) + "\n"
-                            comp_pool = comm_agent_local.get_equity_comp_pool(
+                            yield _STATUS["commercial_equity"]
+                            comp_pool = await asyncio.to_thread(
+                                commercial_agent.get_equity_comp_pool,
                                 property_details.get('address', account_number), property_details
                             )
                             if comp_pool:
@@ -568,59 +944,65 @@ async def get_full_protest(
                         except Exception as e:
                             logger.error(f"Main: Commercial equity fallback failed: {e}")
 
-                # Layer 0: DB lookup by neighborhood_code + building_area (no browser needed)
-                if not real_neighborhood and nbhd_code and bld_area > 0:
-                    db_comps = await supabase_service.get_neighbors_from_db(
-                        current_account, nbhd_code, bld_area, district=prop_district
-                    )
-                    if len(db_comps) >= 3:
-                        real_neighborhood = db_comps
-                        yield json.dumps({"status": f"⚖️ Equity Specialist: Found {len(real_neighborhood)} comps from database instantly."}) + "\n"
-
-                # Layer 1: Cached comps (previously scraped)
+                # Layer 0: DB lookup by neighborhood_code + building_area (no browser needed),
+                # Layer 1: cached comps (previously scraped) — both resolved in one round-trip
                 if not real_neighborhood:
-                    cached_comps = await supabase_service.get_cached_comps(current_account)
-                    if cached_comps:
-                        real_neighborhood = cached_comps
-                        yield json.dumps({"status": f"⚖️ Equity Specialist: Using {len(real_neighborhood)} cached comps."}) + "\n"
-
-                async def scrape_pool(pool_list, limit=3):
-                    sem = asyncio.Semaphore(limit)
+                    comps, comps_source = await supabase_service.find_equity_comps(
+                        current_account, nbhd_code if bld_area > 0 else None, bld_area, district=prop_district
+                    )
+                    if comps_source == "db":
+                        real_neighborhood = comps
+                        yield _ndjson({"status": f"⚖️ Equity Specialist: Found {len(real_neighborhood)} comps from database instantly."})
+                    elif comps_source == "cache":
+                        real_neighborhood = comps
+                        yield _ndjson({"status": f"⚖️ Equity Specialist: Using {len(real_neighborhood)} cached comps."})
+
+                async def scrape_pool(pool_list, limit=None):
+                    sem = asyncio.Semaphore(limit or getattr(connector, "MAX_CONCURRENCY", NEIGHBOR_SCRAPE_CONCURRENCY))
                     async def safe_scrape(neighbor):
                         async with sem:
-                            return await connector.get_property_details(neighbor['account_number'])
+                            try:
+                                return await _get_property_details_cached(connector, current_district, neighbor['account_number'])
+                            except Exception as e:
+                                # One failed neighbor must not cancel the rest of the group
+                                logger.warning(f"Neighbor scrape failed for {neighbor.get('account_number')}: {e}")
+                                return None
                     logger.info(f"Deep-scraping pool of {len(pool_list[:10])} neighbors...")
-                    tasks = [safe_scrape(n) for n in pool_list[:10]]
-                    deep_results = await asyncio.gather(*tasks)
                     usable = []
-                    for res in deep_results:
-                        if res and res.get('building_area', 0) > 0:
-                            usable.append(res)
-                            try:
-                                upsert_data = {
-                                    "account_number": res.get("account_number"),
-                                    "address": res.get("address"),
-                                    "appraised_value": res.get("appraised_value"),
-                                    "building_area": res.get("building_area"),
-                                    "year_built": res.get("year_built"),
-                                    "neighborhood_code": res.get("neighborhood_code"),
-                                    "district": res.get("district"),
-                                    "market_value": res.get("market_value"),
-                                    "building_grade": res.get("building_grade"),
-                                    "land_area": res.get("land_area"),
-                                }
-                                # Filter None to avoid overwriting good data
-                                upsert_data = {k: v for k, v in upsert_data.items() if v is not None}
-                                await supabase_service.upsert_property(upsert_data)
-                            except: pass
+                    async with asyncio.TaskGroup() as tg:
+                        tasks = [tg.create_task(safe_scrape(n)) for n in pool_list[:10]]
+                        for next_done in asyncio.as_completed(tasks):
+                            res = await next_done
+                            if res and res.get('building_area', 0) > 0:
+                                usable.append(res)
+                                if len(usable) >= NEIGHBOR_SCRAPE_TARGET:
+                                    for t in tasks:
+                                        t.cancel()  # enough comps — drop the slower scrapes
+                                    break
+                    upsert_rows = []
+                    for res in usable:
+                        upsert_data = {
+                            "account_number": res.get("account_number"),
+                            "address": res.get("address"),
+                            "appraised_value": res.get("appraised_value"),
+                            "building_area": res.get("building_area"),
+                            "year_built": res.get("year_built"),
+                            "neighborhood_code": res.get("neighborhood_code"),
+                            "district": res.get("district"),
+                            "market_value": res.get("market_value"),
+                            "building_grade": res.get("building_grade"),
+                            "land_area": res.get("land_area"),
+                        }
+                        # Filter None to avoid overwriting good data
+                        upsert_rows.append({k: v for k, v in upsert_data.items() if v is not None})
+                    # One bulk upsert, written after the stream closes — nothing below reads it back
+                    finalize_tasks.add_task(supabase_service.upsert_properties, upsert_rows)
                     return usable
 
                 # Layers 2-3: Playwright fallback (cloud may be blocked)
                 if not real_neighborhood:
-                    yield json.dumps({"status": "⚖️ Equity Specialist: DB insufficient — scraping live neighbors..."}) + "\n"
-                    street_only = prop_address.split(",")[0].strip()
-                    addr_parts = street_only.split()
-                    street_name = " ".join(addr_parts[1:]) if addr_parts and addr_parts[0][0].isdigit() else " ".join(addr_parts)
+                    yield _STATUS["equity_scrape"]
+                    street_name = street_name_from_address(prop_address)
 
                     # Street search
                     discovered_neighbors = await connector.get_neighbors_by_street(street_name)
@@ -632,7 +1014,7 @@ async def get_full_protest(
                 if not real_neighborhood:
                     if nbhd_code and nbhd_code != "Unknown":
                         logger.info(f"No usable neighbors on street. Trying Nbhd Code fallback: {nbhd_code}")
-                        yield json.dumps({"status": f"⚖️ Equity Specialist: Expanding to neighborhood {nbhd_code}..."}) + "\n"
+                        yield _ndjson({"status": f"⚖️ Equity Specialist: Expanding to neighborhood {nbhd_code}..."})
                         nbhd_neighbors = await connector.get_neighbors(nbhd_code)
                         if nbhd_neighbors:
                             # Filter out subject
@@ -646,8 +1028,9 @@ async def get_full_protest(
                     if str(property_details.get('property_type', '')).lower() == 'commercial' and not is_commercial_prop:
                         # Only try this fallback if the dedicated commercial block above didn't already run
                         logger.info("Commercial property: no district neighbors found. Building equity pool from sales comps...")
-                        yield json.dumps({"status": "🏢 Commercial Equity: Building value pool from recent sales comparables..."}) + "\n"
-                        real_neighborhood = commercial_agent.get_equity_comp_pool(
+                        yield _STATUS["commercial_equity"]
+                        real_neighborhood = await asyncio.to_thread(
+                            commercial_agent.get_equity_comp_pool,
                             property_details.get('address', account_number), property_details
                         )
                         if real_neighborhood:
@@ -663,17 +1046,23 @@ async def get_full_protest(
                     else:
                         friendly_error = "Could not find sufficient data for equity analysis. Please try again later or verify the address."
                         logger.warning("Live discovery found no usable neighbors. Returning error to user.")
-                        yield json.dumps({"error": friendly_error}) + "\n"
+                        yield _ndjson({"error": friendly_error})
                         return # Stop execution gracefully
 
-                equity_results['justified_value_floor'] = equity_engine.find_equity_5(property_details, real_neighborhood).get('justified_value_floor', 0)
-                # Merge full equity results safely
-                eq_full = equity_engine.find_equity_5(property_details, real_neighborhood)
+                # Merge full equity results safely (one ranking pass — the result is deterministic)
+                eq_full = await asyncio.to_thread(equity_engine.find_equity_5, property_details, real_neighborhood)
+                equity_results['justified_value_floor'] = eq_full.get('justified_value_floor', 0)
                 equity_results.update(eq_full)
                 
+                # fast=true: a complete DB record plus a full comp set already carries the
+                # argument — skip comp permits and the vision/FEMA stage below
+                skip_enrichment = bool(fast and db_first_hit and len(real_neighborhood) >= 5
+                                       and property_details.get('appraised_value'))
+
                 # 4b. Comparative Permit Analysis
-                comp_renovations = await permit_agent.summarize_comp_renovations(equity_results.get('equity_5', []))
-                property_details['comp_renovations'] = comp_renovations
+                if not skip_enrichment:
+                    comp_renovations = await permit_agent.summarize_comp_renovations(equity_results.get('equity_5', []))
+                    property_details['comp_renovations'] = comp_renovations
             except Exception as e:
                 logger.error(f"Equity Analysis Error: {e}")
                 # Don't clobber sales comps in equity_results if they exist
@@ -685,7 +1074,7 @@ async def get_full_protest(
                 nbhd_for_anomaly = property_details.get('neighborhood_code')
                 dist_for_anomaly = property_details.get('district', current_district or 'HCAD')
                 if nbhd_for_anomaly:
-                    yield json.dumps({"status": "📊 Anomaly Detector: Scoring property against neighborhood..."}) + "\n"
+                    yield _STATUS["anomaly"]
                     anomaly_score = await anomaly_agent.score_property(
                         current_account, nbhd_for_anomaly, dist_for_anomaly
                     )
@@ -696,27 +1085,24 @@ async def get_full_protest(
                         pctile = anomaly_score.get('percentile', 0)
                         logger.info(f"AnomalyDetector: Subject Z={z}, percentile={pctile}")
                         if z > 1.5:
-                            yield json.dumps({"status": f"📊 Anomaly Detected: Property is at the {pctile:.0f}th percentile in its neighborhood (Z={z:.1f})"}) + "\n"
+                            yield _ndjson({"status": f"📊 Anomaly Detected: Property is at the {pctile:.0f}th percentile in its neighborhood (Z={z:.1f})"})
             except Exception as e:
                 logger.warning(f"Anomaly detection failed (non-fatal): {e}")
 
             # ── 4d. Geo-Intelligence: Distance + External Obsolescence ────────
             try:
-                from backend.services.geo_intelligence_service import (
-                    enrich_comps_with_distance, check_external_obsolescence, geocode
-                )
                 prop_address_geo = property_details.get('address', '')
                 if equity_results.get('equity_5') and prop_address_geo:
-                    yield json.dumps({"status": "🌐 Geo-Intelligence: Computing distances and checking surroundings..."}) + "\n"
-                    subj_coords = geocode(prop_address_geo)
-                    enrich_comps_with_distance(prop_address_geo, equity_results['equity_5'], subj_coords)
+                    yield _STATUS["geo"]
+                    subj_coords = await asyncio.to_thread(geocode, prop_address_geo)
+                    await asyncio.to_thread(enrich_comps_with_distance, prop_address_geo, equity_results['equity_5'], subj_coords)
                     # External obsolescence check
                     if subj_coords:
-                        obs_result = check_external_obsolescence(subj_coords['lat'], subj_coords['lng'])
+                        obs_result = await asyncio.to_thread(check_external_obsolescence, subj_coords['lat'], subj_coords['lng'])
                         if obs_result.get('factors'):
                             equity_results['external_obsolescence'] = obs_result
                             property_details['external_obsolescence'] = obs_result
-                            yield json.dumps({"status": f"🌐 Geo-Intelligence: Found {len(obs_result['factors'])} external obsolescence factor(s)"}) + "\n"
+                            yield _ndjson({"status": f"🌐 Geo-Intelligence: Found {len(obs_result['factors'])} external obsolescence factor(s)"})
             except Exception as geo_err:
                 logger.warning(f"Geo-intelligence failed (non-fatal): {geo_err}")
 
@@ -725,7 +1111,7 @@ async def get_full_protest(
                 crime_address = property_details.get('address', '')
                 detected_district = property_details.get('district', district or 'HCAD')
                 if crime_address and is_real_address(crime_address) and detected_district in ('HCAD',):
-                    yield json.dumps({"status": "🚨 Intelligence Agent: Checking neighborhood crime activity for external obsolescence..."}) + "\n"
+                    yield _STATUS["crime"]
                     crime_stats = await crime_agent.get_local_crime_data(crime_address)
                     if crime_stats and crime_stats.get('count', 0) > 0:
                         obs = property_details.get('external_obsolescence', {'factors': []})
@@ -754,59 +1140,38 @@ async def get_full_protest(
             except Exception as crime_err:
                 logger.warning(f"Crime agent failed (non-fatal): {crime_err}")
 
+            # Comps, sales and the adjusted floor are final here; vision, narrative and savings
+            # take the longest, so send a snapshot now and let clients render the tables early.
+            # No "data" key — that still marks the complete payload below.
+            yield _ndjson({"partial": "equity", "property": property_details, "equity": equity_results})
+
             # 5. Vision & Location Analysis (Flood Zones)
-            search_address = property_details.get('address', '')
-            district_key = property_details.get('district', 'HCAD')
-            
-            # Smart Append: Check if address already appears to have a city/state/zip
-            import re
-            has_state_or_zip = re.search(r'(,\s*TX|\bTX\b|\bTexas\b|\d{5}(?:-\d{4})?$)', search_address, re.IGNORECASE)
-            has_comma = ',' in search_address
-            
-            if not has_state_or_zip and not has_comma:
-                 d_map = {
-                    "HCAD": ", Harris County, TX",
-                    "TCAD": ", Travis County, TX",
-                    "DCAD": ", Dallas County, TX",
-                    "CCAD": ", Collin County, TX",
-                    "TAD": ", Tarrant County, TX",
-                    "BCAD": ", Brazoria County, TX" # Safest generic fallback for a multi-city county
-                 }
-                 suffix = d_map.get(district_key, ", TX")
-                 search_address += suffix
-            
-            # Geocode once for both Vision and FEMA
-            coords = vision_agent._geocode_address(search_address)
-            
-            # FEMA Check
-            flood_data = None
-            if coords:
-                cached_flood = await supabase_service.get_cached_flood(current_account)
-                if cached_flood:
-                    flood_data = cached_flood
+            if skip_enrichment:
+                yield _STATUS["fast_mode"]
+                if vision_inputs_task:
+                    vision_inputs_task.cancel()  # free the slot now; the finally below is the backstop
+                flood_data, image_paths, vision_detections = None, [], []
+            else:
+                yield _STATUS["vision"]
+                # Geocode, FEMA and Street View were started before sales/equity analysis,
+                # unless fast mode held them back pending the skip decision
+                if vision_inputs_task is None:
+                    vision_inputs_task = asyncio.create_task(fetch_vision_inputs())
+                flood_data, image_paths = await vision_inputs_task
+                if flood_data:
                     property_details['flood_zone'] = flood_data.get('zone', 'Zone X')
+
+                # Check Vision Cache first
+                cached_vision = caches["vision"]
+                if cached_vision:
+                    yield _STATUS["vision_cached"]
+                    vision_detections = cached_vision
                 else:
-                    flood_data = await fema_agent.get_flood_zone(coords['lat'], coords['lng'])
-                    if flood_data:
-                        property_details['flood_zone'] = flood_data.get('zone', 'Zone X')
-                        await supabase_service.save_cached_flood(current_account, flood_data)
-            
-            # Vision Analysis
-            yield json.dumps({"status": "📸 Vision Agent: Analyzing property condition..."}) + "\n"
-            # Use the cleaned search_address for vision acquisition
-            image_paths = await vision_agent.get_street_view_images(search_address)
-            
-            # Check Vision Cache first
-            cached_vision = await supabase_service.get_cached_vision(current_account)
-            if cached_vision:
-                yield json.dumps({"status": "📸 Vision Agent: Using cached property condition analysis..."}) + "\n"
-                vision_detections = cached_vision
-            else:
-                vision_detections = await vision_agent.analyze_property_condition(image_paths, property_details)
-                if vision_detections:
-                    await supabase_service.save_cached_vision(current_account, vision_detections)
+                    vision_detections = await vision_agent.analyze_property_condition(image_paths, property_details)
+                    if vision_detections:
+                        await supabase_service.save_cached_vision(current_account, vision_detections)
             
-            yield json.dumps({"status": "🔍 AI Condition Analyst: Comparing property conditions across comps..."}) + "\n"
+            yield _STATUS["condition"]
             
             # Combine external obsolescence from FEMA into narrative context
             if flood_data and flood_data.get('is_high_risk'):
@@ -835,13 +1200,12 @@ async def get_full_protest(
             # Use annotated image if possible for evidence
             image_path = image_paths[0] if image_paths else "mock_street_view.jpg"
             if vision_detections and image_path != "mock_street_view.jpg":
-                image_path = vision_agent.draw_detections(image_path, vision_detections)
+                image_path = await asyncio.to_thread(vision_agent.draw_detections, image_path, vision_detections)
 
             # ── 5b. Condition Delta: Compare subject vs comp conditions ────────
             try:
-                from backend.services.condition_delta_service import enrich_comps_with_condition
                 if equity_results.get('equity_5') and image_path != "mock_street_view.jpg":
-                    yield json.dumps({"status": "📸 Condition Delta: Comparing property condition against comps..."}) + "\n"
+                    yield _STATUS["condition_delta"]
                     # Pass vision detections for subject score extraction
                     property_details['vision_detections'] = vision_detections
                     delta_result = await enrich_comps_with_condition(
@@ -852,105 +1216,121 @@ async def get_full_protest(
                         equity_results['condition_delta'] = delta_result
                         delta_val = delta_result.get('condition_delta', 0)
                         if delta_val < -1:
-                            yield json.dumps({"status": f"📸 Condition Delta: Subject is in worse condition than comps (Δ={delta_val:.1f})"}) + "\n"
+                            yield _ndjson({"status": f"📸 Condition Delta: Subject is in worse condition than comps (Δ={delta_val:.1f})"})
             except Exception as cd_err:
                 logger.warning(f"Condition delta failed (non-fatal): {cd_err}")
 
-            yield json.dumps({"status": "\u2728 Savings Estimator: Computing predicted savings range..."}) + "\n"
+            yield _STATUS["savings"]
 
             # 5c. Predictive Savings Estimation
             try:
-                from backend.services.savings_estimator import SavingsEstimator
-                estimator = SavingsEstimator(tax_rate=0.025)
-                savings_prediction = estimator.estimate(property_details, equity_results)
+                savings_prediction = savings_estimator.estimate(property_details, equity_results)
                 equity_results['savings_prediction'] = savings_prediction
                 if savings_prediction.get('signal_count', 0) > 0:
                     prob = savings_prediction.get('protest_success_probability', 0)
                     exp_save = savings_prediction['estimated_savings']['expected']
-                    yield json.dumps({"status": f"\u2728 Protest Strength: {savings_prediction['protest_strength']} ({prob:.0%}) — Expected savings: ${exp_save:,}/yr"}) + "\n"
+                    yield _ndjson({"status": f"\u2728 Protest Strength: {savings_prediction['protest_strength']} ({prob:.0%}) — Expected savings: ${exp_save:,}/yr"})
             except Exception as se_err:
                 logger.warning(f"Savings estimator failed (non-fatal): {se_err}")
 
-            yield json.dumps({"status": "✍️ Legal Narrator: Evaluating protest viability..."}) + "\n"
+            yield _STATUS["narrate"]
             
             # 6. Narrative & PDF
-            narrative = narrative_agent.generate_protest_narrative(property_details, equity_results, vision_detections, market_value)
+            narrative = await asyncio.to_thread(
+                narrative_agent.generate_protest_narrative, property_details, equity_results, vision_detections, market_value
+            )
             
-            yield json.dumps({"status": f"✍️ Legal Narrator: Generating protest narrative ({equity_results.get('sales_count', 0)} sales comps support reduction)..."}) + "\n"
+            yield _ndjson({"status": f"✍️ Legal Narrator: Generating protest narrative ({equity_results.get('sales_count', 0)} sales comps support reduction)..."})
             
-            os.makedirs("outputs", exist_ok=True)
             form_path = f"outputs/Form_41_44_{current_account}.pdf"
-            form_service.generate_form_41_44(property_details, {
-                "narrative": narrative, 
-                "vision_data": vision_detections, 
-                "evidence_image_path": image_path,
-                "equity_results": equity_results
-            }, form_path)
-
-            # Final Save
-            try:
-                prop_record = await supabase_service.get_property_by_account(current_account)
-                if prop_record and "justified_value_floor" in equity_results:
-                    # Use savings estimator if available, else simple formula
-                    sp = equity_results.get('savings_prediction', {})
-                    potential_savings = sp.get('estimated_savings', {}).get('expected', 0) if sp else 0
-                    if not potential_savings:
-                        potential_savings = (property_details.get('appraised_value', 0) - equity_results['justified_value_floor']) * 0.025
-                    protest_record = {
-                        "property_id": prop_record['id'],
-                        "justified_value": equity_results['justified_value_floor'],
-                        "potential_savings": potential_savings,
-                        "narrative": narrative,
-                        "pdf_url": form_path
-                    }
-                    saved_protest = await supabase_service.save_protest(protest_record)
+
+            async def finalize_protest():
+                """Render Form 41.44 and persist the protest + comps once the stream has closed."""
+                # PDF render is seconds of blocking work — keep it off the event loop and let it
+                # run alongside the DB save below (both only read the finished narrative/results)
+                form_task = asyncio.create_task(_render_form_41_44(property_details, {
+                    "narrative": narrative, 
+                    "vision_data": vision_detections, 
+                    "evidence_image_path": image_path,
+                    "equity_results": equity_results
+                }, form_path))
+
+                # Final Save
+                try:
+                    if "justified_value_floor" in equity_results:
+                        # Use savings estimator if available, else simple formula
+                        sp = equity_results.get('savings_prediction', {})
+                        potential_savings = sp.get('estimated_savings', {}).get('expected', 0) if sp else 0
+                        if not potential_savings:
+                            potential_savings = (property_details.get('appraised_value', 0) - equity_results['justified_value_floor']) * 0.025
+                        protest_record = {
+                            "account_number": current_account,  # get_latest_protest looks protests up by account
+                            "justified_value": equity_results['justified_value_floor'],
+                            "potential_savings": potential_savings,
+                            "narrative": narrative,
+                            "pdf_url": form_path
+                        }
+                        if property_row_id:
+                            saved_protest = await supabase_service.save_protest({**protest_record, "property_id": property_row_id})
+                        else:
+                            # Property id unknown — resolve it and insert in one round-trip
+                            saved_protest = await supabase_service.save_protest_for_account(current_account, protest_record)
                     
-                    if saved_protest:
-                        logger.info(f"✅ Saved protest record ID: {saved_protest.get('id')}")
+                        if saved_protest:
+                            logger.info(f"✅ Saved protest record ID: {saved_protest.get('id')}")
                         
-                        # Save the comps used for this protest
-                        # real_neighborhood contains the final used comps (whether neighbors or sales)
-                        if real_neighborhood:
-                            try:
-                                logger.info(f"Saving {len(real_neighborhood)} equity comps to DB...")
-                                # Sanitize comps to remove _raw fields that cause Supabase insert errors
-                                clean_comps = []
-                                for c in real_neighborhood:
-                                    # Create a clean copy with only primitive types + no large blobs
-                                    clean = {
-                                        k: v for k, v in c.items() 
-                                        if k not in ('_raw', 'raw', 'geometry', 'similarity_rationale') 
-                                        and not isinstance(v, (dict, list)) # flat structure only
-                                    }
-                                    # Ensure essential fields are present
-                                    if 'account_number' in clean:
-                                        clean_comps.append(clean)
+                            # Save the comps used for this protest
+                            # real_neighborhood contains the final used comps (whether neighbors or sales)
+                            if real_neighborhood:
+                                try:
+                                    logger.info(f"Saving {len(real_neighborhood)} equity comps to DB...")
+                                    # Sanitize comps to remove _raw fields that cause Supabase insert errors
+                                    clean_comps = []
+                                    for c in real_neighborhood:
+                                        # Create a clean copy with only primitive types + no large blobs
+                                        clean = {
+                                            k: v for k, v in c.items() 
+                                            if k not in ('_raw', 'raw', 'geometry', 'similarity_rationale') 
+                                            and not isinstance(v, (dict, list)) # flat structure only
+                                        }
+                                        # Ensure essential fields are present
+                                        if 'account_number' in clean:
+                                            clean_comps.append(clean)
                                 
-                                await supabase_service.save_equity_comps(saved_protest['id'], clean_comps) 
-                                logger.info(f"✅ Saved {len(clean_comps)} equity comps.")
-                            except Exception as e:
-                                logger.error(f"Failed to save equity comps: {e}")
+                                    await supabase_service.save_equity_comps(saved_protest['id'], clean_comps) 
+                                    logger.info(f"✅ Saved {len(clean_comps)} equity comps.")
+                                except Exception as e:
+                                    logger.error(f"Failed to save equity comps: {e}")
                                 
-                        # Save the sales comps if they exist
-                        if equity_results.get('sales_comps'):
-                            try:
-                                logger.info(f"Saving {len(equity_results['sales_comps'])} sales comps to DB...")
-                                await supabase_service.save_sales_comparables(
-                                    current_account, 
-                                    saved_protest['id'], 
-                                    equity_results['sales_comps']
-                                )
-                                logger.info(f"✅ Saved {len(equity_results['sales_comps'])} sales comps.")
-                            except Exception as e:
-                                logger.error(f"Failed to save sales comps: {e}")
-                    else:
-                        logger.warning("Failed to save protest record (no ID returned).")
+                            # Save the sales comps if they exist
+                            if equity_results.get('sales_comps'):
+                                try:
+                                    logger.info(f"Saving {len(equity_results['sales_comps'])} sales comps to DB...")
+                                    await supabase_service.save_sales_comparables(
+                                        current_account, 
+                                        saved_protest['id'], 
+                                        equity_results['sales_comps']
+                                    )
+                                    logger.info(f"✅ Saved {len(equity_results['sales_comps'])} sales comps.")
+                                except Exception as e:
+                                    logger.error(f"Failed to save sales comps: {e}")
+                        else:
+                            logger.warning("Failed to save protest record (no ID returned).")
 
-            except Exception as e:
-                logger.error(f"❌ DB Save Failed: {e}")
+                except Exception as e:
+                    logger.error(f"❌ DB Save Failed: {e}")
+
+                try:
+                    await form_task
+                except Exception as e:
+                    logger.error(f"❌ Form 41.44 generation failed: {e}")
+
+            # Nothing in the final payload waits on these artifacts (form_path is fixed up
+            # front) — run them as a background task after the last chunk is sent
+            finalize_tasks.add_task(finalize_protest)
 
             # Final Payload
-            yield json.dumps({"data": {
+            data_json = _dumps({
                 "property": property_details,
                 "market_value": market_value,
                 "equity": equity_results,
@@ -958,7 +1338,10 @@ async def get_full_protest(
                 "narrative": narrative,
                 "form_path": form_path,
                 "evidence_image_path": image_path
-            }}) + "\n"
+            })
+            if result_key is not None and not equity_results.get('error'):
+                _protest_result_cache[result_key] = data_json
+            yield b'{"data":' + data_json + b'}\n'
 
         except Exception as e:
             error_msg = str(e)
@@ -966,9 +1349,23 @@ async def get_full_protest(
             if "429" in error_msg or "RESOURCE_EXHAUSTED" in error_msg:
                 friendly_detail = "API Rate Limit Hit: Too many requests. Please wait a minute and try again."
             logger.error(f"FATAL ERROR: {error_msg}\n{traceback.format_exc()}")
-            yield json.dumps({"error": friendly_detail}) + "\n"
-
-    return StreamingResponse(protest_generator(), media_type="application/x-ndjson")
+            yield _ndjson({"error": friendly_detail})
+        finally:
+            # Early returns, stage errors and client disconnects (GeneratorExit) all land here —
+            # don't leave the speculative lookups running
+            for task in (commercial_enrich_task, vision_inputs_task):
+                if task and not task.done():
+                    task.cancel()
+
+    stream = protest_generator()
+    if result_key is not None:
+        flight = _ProtestBroadcast()
+        _inflight_protests[result_key] = flight
+        flight.producer = asyncio.create_task(flight.pump(result_key, stream, finalize_tasks))
+        return StreamingResponse(_with_heartbeat(flight.subscribe()), media_type="application/x-ndjson",
+                                 headers=NDJSON_HEADERS)
+    return StreamingResponse(_with_heartbeat(stream), media_type="application/x-ndjson",
+                             headers=NDJSON_HEADERS, background=finalize_tasks)
 
 if __name__ == "__main__":
     import uvicorn
@@ -978,4 +1375,5 @@ if __name__ == "__main__":
     
     # Disable reload on Windows if using Playwright to avoid loop conflicts
     use_reload = sys.platform != 'win32'
-    uvicorn.run("backend.main:app", host="0.0.0.0", port=8000, reload=use_reload)
+    uvicorn.run("backend.main:app", host="0.0.0.0", port=8000, reload=use_reload,
+                loop="uvloop" if HAS_UVLOOP else "auto")
@@ -47,18 +47,19 @@ def backfill():
         logger.info(f"--- Batch {total_batches} ---")
         logger.info(f"Found {len(properties)} properties to backfill. Calculating vectors...")
         
-        batch_success_count = 0
-        for prop in properties:
-            account_number = prop.get('account_number')
-            if not account_number:
-                continue
-                
-            if vector_store.update_property_embedding(account_number, prop):
-                batch_success_count += 1
-                total_updated += 1
-                if batch_success_count % 200 == 0:
-                    logger.info(f"  Updated {batch_success_count} / {len(properties)} in current batch...")
-                    
+        embeddings = vector_store.compute_embeddings_batch(properties)
+        pairs = [
+            (prop['account_number'], embedding)
+            for prop, embedding in zip(properties, embeddings)
+            if prop.get('account_number')
+        ]
+        batch_success_count = vector_store.update_embeddings_bulk(pairs)
+        total_updated += batch_success_count
+        if pairs and not batch_success_count:
+            # Nothing was written — re-querying would return the same rows forever
+            logger.error(f"Batch {total_batches} failed to update any embeddings; stopping.")
+            break
+
         logger.info(f"Finished Batch {total_batches}. Updated {batch_success_count}/{len(properties)} records.")
 
 if __name__ == "__main__":
@@ -6,6 +6,19 @@ from backend.db.vector_store import vector_store
 
 logger = logging.getLogger(__name__)
 
+_FEATURE_KEYS = ('building_area', 'year_built', 'land_area', 'appraised_value')
+_FEATURE_DEFAULTS = (0.0, 1980.0, 0.0, 0.0)
+
+
+def _feature_matrix(comps) -> np.ndarray:
+    """Comps as one (n, 4) float array: area, year, land, value (missing -> defaults)."""
+    rows = [
+        [c.get(k) or d for k, d in zip(_FEATURE_KEYS, _FEATURE_DEFAULTS)]
+        for c in comps
+    ]
+    return np.asarray(rows, dtype=np.float64).reshape(-1, len(_FEATURE_KEYS))
+
+
 class AdjustmentModel:
     def __init__(self):
         pass
@@ -36,25 +49,15 @@ class AdjustmentModel:
                 return default_rates
 
             # 2. Extract features (X) and target (y = appraised_value)
-            X = []
-            y = []
-            
-            for c in comps:
-                area = float(c.get('building_area') or 0)
-                year = float(c.get('year_built') or 1980)
-                land = float(c.get('land_area') or 0)
-                val = float(c.get('appraised_value') or 0)
-                
-                if area > 0 and val > 0:
-                    y.append(val)
-                    X.append([area, year, land])
+            data = _feature_matrix(comps)
+            data = data[(data[:, 0] > 0) & (data[:, 3] > 0)]
             
-            if len(X) < 10:
+            if len(data) < 10:
                 logger.warning("AdjustmentModel: Not enough valid numerical data for regression.")
                 return default_rates
 
-            X_np = np.array(X)
-            y_np = np.array(y)
+            X_np = data[:, :3]
+            y_np = data[:, 3]
 
             # 3. Fit Ridge Regression (L2 regularization handles multi-collinearity well)
             # Alpha = 10.0 provides strong smoothing to prevent wild coefficient swings
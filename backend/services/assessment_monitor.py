@@ -8,7 +8,7 @@ Uses valuation_history from the properties table to compare years.
 
 import logging
 from typing import Dict, List, Optional
-from backend.db.supabase_client import SupabaseService
+from backend.db.supabase_client import supabase_service
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +16,8 @@ logger = logging.getLogger(__name__)
 class AssessmentMonitor:
 
     def __init__(self):
-        self.supabase = SupabaseService()
+        # Shared service: one client and connection pool per process, not one per monitor
+        self.supabase = supabase_service
 
     async def add_watch(self, account_number: str, district: str = 'HCAD',
                         threshold_pct: float = 5.0) -> Dict:
@@ -104,7 +105,9 @@ class AssessmentMonitor:
             acct = watch.get('account_number', '')
             threshold = float(watch.get('alert_threshold_pct', 5.0))
             try:
-                prop = await self.supabase.get_property_by_account(acct)
+                prop = await self.supabase.get_property_by_account(
+                    acct, fields="address, appraised_value, valuation_history"
+                )
                 if not prop:
                     continue
 
@@ -15,25 +15,27 @@ try:
 except ImportError:
     HAS_QRCODE = False
 
+# Non-latin-1 characters → ASCII equivalents. Built once: clean_text runs for every
+# address/narrative cell drawn into the PDFs.
+_LATIN1_TRANSLATION = str.maketrans({
+    # Smart quotes
+    "\u2018": "'", "\u2019": "'", "\u201a": "'", "\u201b": "'",
+    "\u201c": '"', "\u201d": '"', "\u201e": '"', "\u201f": '"',
+    # Dashes
+    "\u2013": "-", "\u2014": "-", "\u2015": "-",
+    # Other punctuation
+    "\u2026": "...", "\u2022": "*", "\u00b7": "*",
+    "\u00a7": "Sect.", "\u00a9": "(C)", "\u00ae": "(R)", "\u2122": "(TM)",
+    # Unicode spaces
+    "\u00a0": " ", "\u2009": " ", "\u200a": " ", "\u2002": " ",
+    "\u2003": " ", "\u202f": " ", "\u205f": " ", "\u3000": " ",
+})
+
 def clean_text(text: str) -> str:
     """Replace non-latin-1 characters with ASCII equivalents, preserving spaces."""
     if not text:
         return ""
-    replacements = {
-        # Smart quotes
-        "\u2018": "'", "\u2019": "'", "\u201a": "'", "\u201b": "'",
-        "\u201c": '"', "\u201d": '"', "\u201e": '"', "\u201f": '"',
-        # Dashes
-        "\u2013": "-", "\u2014": "-", "\u2015": "-",
-        # Other punctuation
-        "\u2026": "...", "\u2022": "*", "\u00b7": "*",
-        "\u00a7": "Sect.", "\u00a9": "(C)", "\u00ae": "(R)", "\u2122": "(TM)",
-        # Unicode spaces
-        "\u00a0": " ", "\u2009": " ", "\u200a": " ", "\u2002": " ",
-        "\u2003": " ", "\u202f": " ", "\u205f": " ", "\u3000": " ",
-    }
-    for char, replacement in replacements.items():
-        text = text.replace(char, replacement)
+    text = text.translate(_LATIN1_TRANSLATION)
     return text.encode('latin-1', 'replace').decode('latin-1')
 
 def safe_str(val, default='N/A'):
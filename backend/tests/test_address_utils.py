@@ -0,0 +1,34 @@
+import sys
+import os
+import unittest
+
+# Ensure backend is on path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(current_dir))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.utils.address_utils import correct_district_city
+
+
+class TestCorrectDistrictCity(unittest.TestCase):
+    def test_houston_is_replaced_for_other_districts(self):
+        self.assertEqual(correct_district_city("123 Elm St, Houston, TX 75201", "DCAD"), "123 Elm St, Dallas, TX 75201")
+        self.assertEqual(correct_district_city("9 Oak Ln, houston,  tx", "TAD"), "9 Oak Ln, Fort Worth, TX")
+
+    def test_idempotent(self):
+        once = correct_district_city("500 Main St, Houston, TX", "TCAD")
+        self.assertEqual(once, "500 Main St, Austin, TX")
+        self.assertEqual(correct_district_city(once, "TCAD"), once)
+
+    def test_left_alone(self):
+        addr = "500 Main St, Houston, TX"
+        self.assertEqual(correct_district_city(addr, "HCAD"), addr)
+        self.assertEqual(correct_district_city(addr, "BCAD"), addr)  # multi-city county
+        self.assertEqual(correct_district_city(addr, None), addr)
+        self.assertEqual(correct_district_city("12 Houstonia Dr, Plano, TX", "CCAD"), "12 Houstonia Dr, Plano, TX")
+        self.assertEqual(correct_district_city("", "DCAD"), "")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import sys
+import os
+import unittest
+from unittest.mock import MagicMock
+
+# Ensure backend is on path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(current_dir))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.db.supabase_client import SupabaseService
+
+ACCOUNT = "TEST_ACCOUNT_123"
+PROTEST_ID = "123e4567-e89b-12d3-a456-426614174000"
+
+# One comp with the API's snake_case keys (distance/similarity are the historically
+# mismatched ones), one with the RentCast display keys used by the PDF tables.
+MOCK_COMPS = [
+    {
+        "address": "123 Test Street",
+        "sale_price": 500000,
+        "sale_date": "2023-05-15",
+        "sqft": 2500,
+        "price_per_sqft": 200.0,
+        "year_built": 2005,
+        "source": "RentCast",
+        "distance": 0.5,
+        "similarity": 0.95,
+        "property_type": "Single Family",
+    },
+    {
+        "Address": "456 Mock Ave",
+        "Sale Price": "$480,000",
+        "Sale Date": "2023-08-20 (Loan)",
+        "SqFt": "2,400",
+        "Price/SqFt": "$200",
+        "Year Built": "N/A",
+        "Distance": "1.2 mi",
+        "Type": "Single Family (Inferred)",
+    },
+]
+
+
+class TestSaveSalesComparables(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.service = SupabaseService()
+        self.mock_client = MagicMock()
+        self.mock_client.rpc.return_value.execute.return_value = MagicMock(data=len(MOCK_COMPS))
+        self.service.client = self.mock_client
+
+    async def test_rows_are_normalized_and_sent_in_one_rpc(self):
+        await self.service.save_sales_comparables(ACCOUNT, PROTEST_ID, MOCK_COMPS)
+
+        self.mock_client.rpc.assert_called_once()
+        name, params = self.mock_client.rpc.call_args.args
+        self.assertEqual(name, "replace_sales_comparables")
+        self.assertEqual(params["p_account_number"], ACCOUNT)
+        self.mock_client.table.assert_not_called()
+
+        api_row, display_row = params["p_rows"]
+        self.assertEqual(api_row, {
+            "account_number": ACCOUNT,
+            "protest_id": PROTEST_ID,
+            "address": "123 Test Street",
+            "sale_price": 500000,
+            "sale_date": "2023-05-15",
+            "sqft": 2500,
+            "price_per_sqft": 200.0,
+            "year_built": 2005,
+            "source": "RentCast",
+            "dist_from_subject": 0.5,
+            "similarity_score": 0.95,
+            "property_type": "Single Family",
+        })
+        self.assertEqual(display_row["sale_price"], 480000.0)
+        self.assertEqual(display_row["sale_date"], "2023-08-20")
+        self.assertEqual(display_row["sqft"], 2400)
+        self.assertEqual(display_row["price_per_sqft"], 200.0)
+        self.assertIsNone(display_row["year_built"])
+        self.assertEqual(display_row["dist_from_subject"], 1.2)
+        self.assertEqual(display_row["property_type"], "Single Family")
+        self.assertEqual(display_row["source"], "RentCast")
+
+    async def test_empty_comps_skip_the_database(self):
+        await self.service.save_sales_comparables(ACCOUNT, PROTEST_ID, [])
+        self.mock_client.rpc.assert_not_called()
+
+
+@unittest.skipUnless(os.getenv("RUN_SUPABASE_INTEGRATION"), "set RUN_SUPABASE_INTEGRATION=1 to hit a real Supabase project")
+class TestSaveSalesComparablesIntegration(unittest.IsolatedAsyncioTestCase):
+    async def test_round_trip(self):
+        service = SupabaseService()
+        self.assertIsNotNone(service.client, "SUPABASE_URL / SUPABASE_KEY must be set")
+        try:
+            await service.save_sales_comparables(ACCOUNT, PROTEST_ID, MOCK_COMPS)
+            result = service.client.table("sales_comparables").select("*").eq("account_number", ACCOUNT).execute()
+            self.assertEqual(len(result.data), len(MOCK_COMPS))
+        finally:
+            service.client.table("sales_comparables").delete().eq("account_number", ACCOUNT).execute()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,14 @@
 import re
 import logging
 from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# str.translate table dropping ASCII punctuation (keeps letters, digits, whitespace) before address search
+ADDR_PUNCT_TABLE = {i: None for i in range(128) if not chr(i).isalnum() and not chr(i).isspace()}
+
 def is_real_address(address: str) -> bool:
     """
     Detects if an address is a placeholder/dummy or an account number masquerading as an address.
@@ -28,6 +33,72 @@ def is_real_address(address: str) -> bool:
         
     return True
 
+# Leading house-number token (anything starting with a digit: "123", "123A", "3rd") and the
+# street part before the first comma
+_STREET_NAME_RX = re.compile(r'^\s*(?:\d\S*(?:\s+|$))?([^,]*)')
+
+
+def street_name_from_address(address: str) -> str:
+    """Street portion of an address without the house number: "123 Main St, Houston" -> "Main St"."""
+    if not address:
+        return ""
+    return " ".join(_STREET_NAME_RX.match(address).group(1).split())
+
+
+# City/county name fragments per appraisal district, in match priority order (Collin before
+# Dallas so "Dallas Pkwy, Plano" resolves to CCAD). Matching is substring, case-insensitive.
+_DISTRICT_CITIES = (
+    ("CCAD", ("plano", "frisco", "mckinney", "allen", "wylie", "prosper", "celina", "melissa", "collin")),
+    ("DCAD", ("dallas", "irving", "garland", "grand prairie", "richardson", "mesquite", "carrollton",
+              "coppell", "duncanville", "desoto", "cedar hill")),
+    ("TCAD", ("austin", "pflugerville", "lakeway", "manor", "bee cave", "round rock", "travis")),
+    ("TAD",  ("fort worth", "arlington", "euless", "bedford", "hurst", "haltom city", "keller",
+              "southlake", "grapevine", "colleyville", "tarrant")),
+    ("BCAD", ("brazoria", "pearland", "angleton", "alvin", "freeport", "lake jackson", "manvel")),
+    ("HCAD", ("houston", "harris", "katy", "cypress", "spring", "tomball", "humble", "bellaire",
+              "pasadena", "baytown", "deer park", "la porte", "sugar land")),
+)
+# One compiled alternation per district: a single scan each instead of one `in` per city
+_DISTRICT_CITY_RX = tuple(
+    (district, re.compile("|".join(map(re.escape, cities)), re.IGNORECASE))
+    for district, cities in _DISTRICT_CITIES
+)
+
+
+def district_from_address(address: str) -> Optional[str]:
+    """Infers the appraisal district from a city/county name in a free-text address."""
+    if not address:
+        return None
+    for district, rx in _DISTRICT_CITY_RX:
+        if rx.search(address):
+            return district
+    return None
+
+# Principal city per single-city district. Multi-city counties like BCAD are left out so
+# callers don't override e.g. Pearland with the county seat.
+DISTRICT_PRIMARY_CITY = {
+    "HCAD": "Houston, TX",
+    "TCAD": "Austin, TX",
+    "DCAD": "Dallas, TX",
+    "CCAD": "Plano, TX",
+    "TAD": "Fort Worth, TX",
+}
+
+_HOUSTON_TX_RX = re.compile(r'\bHouston,\s*TX\b', re.IGNORECASE)
+
+
+def correct_district_city(address: str, district: Optional[str]) -> str:
+    """
+    Replaces a stray "Houston, TX" with the district's own city — RentCast and legacy rows
+    defaulted non-HCAD addresses to Houston. Returns the address unchanged for HCAD, for
+    multi-city districts, and when the district's city is already present.
+    """
+    city = DISTRICT_PRIMARY_CITY.get(district)
+    if not address or not city or district == "HCAD" or city in address:
+        return address
+    return _HOUSTON_TX_RX.sub(city, address)
+
+@lru_cache(maxsize=4096)
 def normalize_address(address: str, district: str = "HCAD") -> str:
     """
     Normalizes an address string:
@@ -49,15 +120,7 @@ def normalize_address(address: str, district: str = "HCAD") -> str:
         
     # 2. Smart City Append based on District
     # Definition of "has city" is rough, but looking for the specific city name is safer
-    district_map = {
-        "HCAD": "Houston, TX",
-        "TCAD": "Austin, TX",
-        "DCAD": "Dallas, TX",
-        "CCAD": "Plano, TX",
-        "TAD": "Fort Worth, TX"
-    }
-    
-    target_city = district_map.get(district, "Houston, TX")
+    target_city = DISTRICT_PRIMARY_CITY.get(district, "Houston, TX")
     short_city = target_city.split(",")[0] # e.g. "Dallas"
     
     # Check if the address already contains the city (e.g. "Dallas" or "Dallas, TX")
@@ -97,6 +160,7 @@ _UNIT_PATTERN = re.compile(
 )
 
 
+@lru_cache(maxsize=4096)
 def normalize_address_for_search(raw: str) -> str:
     """
     Normalizes a raw user-typed address for consistent API lookup:
@@ -0,0 +1,15 @@
+from dotenv import load_dotenv
+
+_env_loaded = False
+
+def load_env() -> None:
+    """
+    Loads the project .env into os.environ once per process.
+    Modules that read settings at import time call this instead of load_dotenv(),
+    so the .env search and parse happen a single time however many of them are imported.
+    """
+    global _env_loaded
+    if _env_loaded:
+        return
+    load_dotenv()
+    _env_loaded = True
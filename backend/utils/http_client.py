@@ -0,0 +1,39 @@
+import asyncio
+import logging
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# One pooled client per event loop, shared by the third-party API agents. Keep-alive
+# (and HTTP/2 where the server offers it) skips the TCP+TLS handshake on repeat calls.
+_shared_client: Optional[httpx.AsyncClient] = None
+_shared_loop = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide AsyncClient for the running loop, creating it on demand."""
+    global _shared_client, _shared_loop
+    loop = asyncio.get_running_loop()
+    if _shared_client is None or _shared_client.is_closed or _shared_loop is not loop:
+        # Scripts call asyncio.run() repeatedly — a pool bound to a dead loop is unusable
+        _shared_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=50, max_connections=200),
+            timeout=10,
+        )
+        _shared_loop = loop
+    return _shared_client
+
+
+async def close_http_client() -> None:
+    """Close the shared client (called from the API lifespan on shutdown)."""
+    global _shared_client, _shared_loop
+    try:
+        if _shared_client is not None and _shared_loop is asyncio.get_running_loop():
+            await _shared_client.aclose()
+    except Exception as e:
+        logger.warning(f"HTTP client: Error closing shared client: {e}")
+    finally:
+        _shared_client = _shared_loop = None
@@ -0,0 +1,9 @@
+-- Migration 008: Index for DB-first neighbor lookups
+-- Backs SupabaseService.get_neighbors_from_db, which filters on
+--   district = ? AND neighborhood_code LIKE '<base>%' AND neighborhood_code ~ '<regex>'
+--   AND building_area BETWEEN ? AND ? AND appraised_value > 0
+-- text_pattern_ops lets the prefix LIKE use the btree regardless of collation.
+
+CREATE INDEX IF NOT EXISTS idx_properties_district_nbhd_area
+    ON properties (district, neighborhood_code text_pattern_ops, building_area)
+    WHERE appraised_value > 0;
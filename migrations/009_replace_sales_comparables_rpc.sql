@@ -0,0 +1,30 @@
+-- Migration 009: Atomic replace of an account's sales comparables
+-- SupabaseService.save_sales_comparables used to DELETE then INSERT as two
+-- separate PostgREST calls; a failure in between left the account with no rows.
+-- This function does both inside one transaction and returns the inserted count.
+
+CREATE OR REPLACE FUNCTION replace_sales_comparables (
+  p_account_number text,
+  p_rows jsonb
+) RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  inserted integer;
+BEGIN
+  DELETE FROM sales_comparables WHERE account_number = p_account_number;
+
+  INSERT INTO sales_comparables (
+    account_number, protest_id, address, sale_price, sale_date, sqft,
+    price_per_sqft, year_built, source, dist_from_subject, similarity_score, property_type
+  )
+  SELECT
+    r.account_number, r.protest_id, r.address, r.sale_price, r.sale_date, r.sqft,
+    r.price_per_sqft, r.year_built, COALESCE(r.source, 'RentCast'), r.dist_from_subject,
+    r.similarity_score, r.property_type
+  FROM jsonb_populate_recordset(NULL::sales_comparables, p_rows) AS r;
+
+  GET DIAGNOSTICS inserted = ROW_COUNT;
+  RETURN inserted;
+END;
+$$;
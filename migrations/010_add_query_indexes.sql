@@ -0,0 +1,23 @@
+-- Migration 010: Indexes for the query shapes used by backend/db/supabase_client.py
+-- Keep this file in sync when SupabaseService gains a new filter/order pattern.
+--
+--   properties        WHERE account_number = ?                       (unique key used by upsert on_conflict)
+--   properties        WHERE district = ? AND neighborhood_code ...   (migrations/008)
+--   properties        WHERE q <% address  (trigram, via RPC)       (search_address_globally, migrations/011)
+--   protests          WHERE account_number = ? ORDER BY created_at DESC LIMIT 1
+--   property_deeds    WHERE acct = ? ORDER BY date_of_sale DESC
+--   sales_comparables WHERE account_number = ?                       (idx_sales_comparables_account)
+
+-- Latest-protest lookup: satisfies both the filter and the ORDER BY ... LIMIT 1
+CREATE INDEX IF NOT EXISTS idx_protests_account_created
+    ON public.protests (account_number, created_at DESC);
+
+-- Deed history / last-sale fallback: replaces the separate acct and date_of_sale indexes for this query
+CREATE INDEX IF NOT EXISTS idx_deeds_acct_date
+    ON property_deeds (acct, date_of_sale DESC);
+
+-- Fuzzy/substring address matching cannot use a btree; a trigram GIN index serves
+-- both ILIKE '%...%' and the word-similarity <% operator used by migrations/011
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS idx_properties_address_trgm
+    ON properties USING gin (address gin_trgm_ops);
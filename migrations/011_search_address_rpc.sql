@@ -0,0 +1,35 @@
+-- Migration 011: Ranked fuzzy address search
+-- Replaces the three sequential ILIKE '%...%' fallbacks in
+-- SupabaseService.search_address_globally with one indexed, ranked query.
+--
+-- word_similarity / <% compares the query against the best-matching run of
+-- words inside the address, so "825 Town and Country Lane" still finds
+-- "825 TOWN AND COUNTRY LN, HOUSTON, TX 77024" without the caller having to
+-- strip the city or retry with a shorter prefix. Uses the trigram GIN index
+-- from migrations/010.
+
+CREATE OR REPLACE FUNCTION search_properties_by_address (
+  p_query text,
+  p_limit int DEFAULT 5
+) RETURNS TABLE (
+  account_number text,
+  address text,
+  district text,
+  appraised_value float8,
+  similarity float8
+)
+LANGUAGE sql
+STABLE
+SET pg_trgm.word_similarity_threshold = 0.5
+AS $$
+  SELECT
+    p.account_number,
+    p.address,
+    p.district,
+    p.appraised_value::float8,
+    word_similarity(p_query, p.address)::float8 AS similarity
+  FROM properties p
+  WHERE p_query <% p.address
+  ORDER BY similarity DESC, p.account_number
+  LIMIT p_limit;
+$$;
@@ -0,0 +1,23 @@
+-- Migration 012: Let PostgREST embed property_deeds under properties
+-- SupabaseService.get_last_sale_date reads properties.last_sale_date and, when
+-- it is NULL, the newest deed — in one request:
+--   properties?select=last_sale_date,property_deeds(date_of_sale)
+--             &property_deeds.order=date_of_sale.desc&property_deeds.limit=1
+--
+-- Embedding needs a relationship. A real FOREIGN KEY (property_deeds.acct ->
+-- properties.account_number) can't be used: the deed table is bulk-loaded from
+-- HCAD deeds.txt and covers accounts that have never been upserted into
+-- properties. A computed relationship (PostgREST >= 11) gives the same embed
+-- without constraining the import. Served by idx_deeds_acct_date (migrations/010).
+
+CREATE OR REPLACE FUNCTION property_deeds (properties)
+RETURNS SETOF property_deeds
+ROWS 10
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT * FROM property_deeds WHERE acct = $1.account_number;
+$$;
+
+-- Pick up the new relationship without restarting PostgREST
+NOTIFY pgrst, 'reload schema';
@@ -0,0 +1,73 @@
+-- Migration 013: Neighbor lookup + comp-cache fallback in one call
+-- Both protest pipelines ask for DB neighbors (SupabaseService.get_neighbors_from_db)
+-- and, when fewer than p_min_db_comps come back, make a second round-trip for
+-- the previously scraped properties.cached_comps blob. This function runs both
+-- steps server-side and returns whichever one satisfied the request:
+--
+--   {"source": "db" | "cache" | null, "comps": [...]}
+--
+-- Filters mirror get_neighbors_from_db: the prefix LIKE uses
+-- idx_properties_district_nbhd_area (migrations/008) and the anchored regex
+-- rejects longer codes (8401 must not match 84010). Pass p_code_prefix NULL to
+-- skip the neighbor lookup, and p_min_area/p_max_area NULL to skip the area band.
+
+CREATE OR REPLACE FUNCTION find_equity_comps (
+  p_account_number text,
+  p_district text,
+  p_code_prefix text,
+  p_code_pattern text,
+  p_min_area int,
+  p_max_area int,
+  p_limit int DEFAULT 20,
+  p_min_db_comps int DEFAULT 3,
+  p_cache_cutoff timestamptz DEFAULT NULL
+) RETURNS jsonb
+LANGUAGE plpgsql
+STABLE
+AS $$
+DECLARE
+  db_comps jsonb := '[]'::jsonb;
+  cached jsonb;
+BEGIN
+  IF p_code_prefix IS NOT NULL THEN
+    SELECT COALESCE(jsonb_agg(to_jsonb(n)), '[]'::jsonb) INTO db_comps
+    FROM (
+      SELECT
+        p.account_number, p.address, p.appraised_value, p.market_value, p.building_area,
+        p.land_area, p.year_built, p.neighborhood_code, p.district, p.building_grade,
+        p.building_quality, p.valuation_history, p.land_breakdown, p.last_sale_date, p.deed_count
+      FROM properties p
+      WHERE p.district = p_district
+        AND p.neighborhood_code LIKE p_code_prefix
+        AND p.neighborhood_code ~ p_code_pattern
+        AND p.account_number <> p_account_number
+        AND p.appraised_value > 0
+        AND (p_min_area IS NULL OR (p.building_area BETWEEN p_min_area AND p_max_area AND p.building_area > 0))
+      LIMIT p_limit
+    ) n;
+
+    IF jsonb_array_length(db_comps) >= p_min_db_comps THEN
+      RETURN jsonb_build_object('source', 'db', 'comps', db_comps);
+    END IF;
+  END IF;
+
+  IF p_cache_cutoff IS NOT NULL THEN
+    SELECT to_jsonb(p.cached_comps) INTO cached
+    FROM properties p
+    WHERE p.account_number = p_account_number
+      AND p.comps_scraped_at > p_cache_cutoff
+    LIMIT 1;
+
+    -- Older writes stored the list as a JSON string; unwrap it
+    IF jsonb_typeof(cached) = 'string' THEN
+      cached := (cached #>> '{}')::jsonb;
+    END IF;
+
+    IF jsonb_typeof(cached) = 'array' AND jsonb_array_length(cached) > 0 THEN
+      RETURN jsonb_build_object('source', 'cache', 'comps', cached);
+    END IF;
+  END IF;
+
+  RETURN jsonb_build_object('source', NULL, 'comps', '[]'::jsonb);
+END;
+$$;
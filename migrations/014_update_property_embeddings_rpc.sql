@@ -0,0 +1,28 @@
+-- Migration 014: Bulk embedding writes
+-- VectorStore.update_property_embedding issues one PostgREST UPDATE per account;
+-- backfills call it for every row of a 1000-property chunk. This function applies
+-- a whole chunk in one statement and returns the number of rows updated.
+--
+-- UPDATE ... FROM rather than an upsert: the payload only carries
+-- (account_number, embedding), and an INSERT ... ON CONFLICT would try to build a
+-- full properties row for accounts that don't exist yet.
+--
+--   p_rows: [{"account_number": "...", "embedding": "[0.1,0.2,0.3,0.4]"}, ...]
+
+CREATE OR REPLACE FUNCTION update_property_embeddings (
+  p_rows jsonb
+) RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  updated integer;
+BEGIN
+  UPDATE properties p
+  SET embedding = r.embedding::vector(4)
+  FROM jsonb_to_recordset(p_rows) AS r(account_number text, embedding text)
+  WHERE p.account_number = r.account_number;
+
+  GET DIAGNOSTICS updated = ROW_COUNT;
+  RETURN updated;
+END;
+$$;
@@ -0,0 +1,34 @@
+-- Migration 015: Save a protest by account number in one call
+-- The /protest pipeline normally knows the properties.id from its early upsert.
+-- When that upsert was skipped (placeholder address, write error) it had to
+-- re-select the id and then insert the protest: two round-trips. This function
+-- resolves the property and inserts the protest in one statement, returning the
+-- new protest row, or NULL when the account has no properties row.
+--
+--   p_protest: {"justified_value": ..., "potential_savings": ..., "narrative": "...", "pdf_url": "..."}
+
+CREATE OR REPLACE FUNCTION save_protest_for_account (
+  p_account_number text,
+  p_protest jsonb
+) RETURNS jsonb
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  saved jsonb;
+BEGIN
+  INSERT INTO protests (property_id, account_number, justified_value, potential_savings, narrative, pdf_url)
+  SELECT
+    p.id,
+    p_account_number,
+    (p_protest->>'justified_value')::numeric,
+    (p_protest->>'potential_savings')::numeric,
+    p_protest->>'narrative',
+    p_protest->>'pdf_url'
+  FROM properties p
+  WHERE p.account_number = p_account_number
+  LIMIT 1
+  RETURNING to_jsonb(protests.*) INTO saved;
+
+  RETURN saved;
+END;
+$$;
@@ -0,0 +1,20 @@
+-- Migration 016: Address search + row fetch in one call
+-- When /protest is given a typed address it ran search_properties_by_address
+-- (migrations/011) to find the account, then selected the full properties row
+-- for that account: two round-trips against the same table. This function
+-- ranks candidates the same way and returns the best match's full row as JSON,
+-- or NULL when nothing clears the word-similarity threshold.
+
+CREATE OR REPLACE FUNCTION resolve_property_by_address (
+  p_query text
+) RETURNS jsonb
+LANGUAGE sql
+STABLE
+SET pg_trgm.word_similarity_threshold = 0.5
+AS $$
+  SELECT to_jsonb(p)
+  FROM properties p
+  WHERE p_query <% p.address
+  ORDER BY word_similarity(p_query, p.address) DESC, p.account_number
+  LIMIT 1;
+$$;
@@ -29,10 +29,10 @@ class ReportState(rx.State):
         yield
 
         try:
-            from backend.db.supabase_client import supabase_service
+            from backend.db.supabase_client import supabase_service, PROPERTY_CORE_COLS
 
             # Get property
-            prop = await supabase_service.get_property_by_account(self.account)
+            prop = await supabase_service.get_property_by_account(self.account, fields=PROPERTY_CORE_COLS)
             if prop:
                 self.property_data = prop
             else:
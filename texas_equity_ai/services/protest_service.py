@@ -183,7 +183,7 @@ async def run_protest_pipeline(
             resolve_addr = original_address or (current_account if any(c.isalpha() for c in current_account) else "")
             ptype, ptype_source = await resolve_property_type(
                 account_number=current_account, address=resolve_addr,
-                district=current_district or "HCAD",
+                district=current_district or "HCAD", cached_property=cached_property or {},
             )
             is_likely_commercial = (ptype == "Commercial")
             logger.info(f"PropertyTypeResolver: {ptype} ({ptype_source})")
@@ -212,7 +212,7 @@ async def run_protest_pipeline(
                 ptype2, src2 = await resolve_property_type(
                     account_number=current_account,
                     address=current_account if any(c.isalpha() for c in current_account) else "",
-                    district=current_district or "HCAD",
+                    district=current_district or "HCAD", cached_property=cached_property or {},
                 )
                 ptype, ptype_source = ptype2, src2
                 is_likely_commercial = (ptype2 == "Commercial")
@@ -237,7 +237,9 @@ async def run_protest_pipeline(
                     yield {"status": "⚠️ Commercial enrichment yielded limited data. Trying district portal..."}
                 else:
                     yield {"status": f"⛏️ Residential Flow: Scraping {current_district or 'District'} records..."}
-                property_details = await connector.get_property_details(current_account, address=original_address)
+                property_details = await connector.get_property_details(
+                    current_account, address=original_address, cached_record=cached_property or {}
+                )
 
         if property_details and property_details.get('account_number'):
             current_account = property_details.get('account_number')
@@ -355,15 +357,11 @@ async def run_protest_pipeline(
 
             # Commercial comp discovery
             if is_commercial_prop:
-                if nbhd_code:
-                    db_comps = await supabase_service.get_neighbors_from_db(current_account, nbhd_code, bld_area, district=prop_district)
-                    if len(db_comps) >= 3:
-                        real_neighborhood = db_comps
+                comps, comps_source = await supabase_service.find_equity_comps(current_account, nbhd_code, bld_area, district=prop_district)
+                if comps_source:
+                    real_neighborhood = comps
+                    if comps_source == "db":
                         yield {"status": f"⚖️ Equity Specialist: Found {len(real_neighborhood)} commercial comps from database."}
-                if not real_neighborhood:
-                    cached = await supabase_service.get_cached_comps(current_account)
-                    if cached:
-                        real_neighborhood = cached
                 if not real_neighborhood:
                     try:
                         from backend.agents.commercial_enrichment_agent import CommercialEnrichmentAgent
@@ -377,16 +375,15 @@ async def run_protest_pipeline(
 
             if not real_neighborhood:
                 logger.info(f"EQUITY DEBUG: Residential path entered. force_fresh={force_fresh_comps}, nbhd_code={nbhd_code}, bld_area={bld_area}")
-                if not force_fresh_comps and nbhd_code and bld_area > 0:
-                    db_comps = await supabase_service.get_neighbors_from_db(current_account, nbhd_code, bld_area, district=prop_district)
-                    logger.info(f"EQUITY DEBUG: DB returned {len(db_comps)} comps")
-                    if len(db_comps) >= 3:
-                        real_neighborhood = db_comps
-                        yield {"status": f"⚖️ Equity Specialist: Found {len(real_neighborhood)} comps from database."}
-                if not real_neighborhood and not force_fresh_comps:
-                    cached = await supabase_service.get_cached_comps(current_account)
-                    if cached:
-                        real_neighborhood = cached
+                if not force_fresh_comps:
+                    comps, comps_source = await supabase_service.find_equity_comps(
+                        current_account, nbhd_code if bld_area > 0 else None, bld_area, district=prop_district
+                    )
+                    logger.info(f"EQUITY DEBUG: DB/cache returned {len(comps)} comps (source={comps_source})")
+                    if comps_source:
+                        real_neighborhood = comps
+                        if comps_source == "db":
+                            yield {"status": f"⚖️ Equity Specialist: Found {len(real_neighborhood)} comps from database."}
 
             # Playwright scraping (residential only)
             if not real_neighborhood and not is_commercial_prop:
@@ -92,25 +92,8 @@ def detect_district(raw_acc: str) -> str | None:
 
     # 2. City name fallback
     if not target and any(c.isalpha() for c in raw_acc):
-        lower = raw_acc.lower()
-        city_map = {
-            # Dallas County (DCAD)
-            "dallas": "DCAD", "irving": "DCAD", "garland": "DCAD", "grand prairie": "DCAD", "richardson": "DCAD", "mesquite": "DCAD", "carrollton": "DCAD", "coppell": "DCAD", "duncanville": "DCAD", "desoto": "DCAD", "cedar hill": "DCAD",
-            # Travis County (TCAD)
-            "austin": "TCAD", "pflugerville": "TCAD", "lakeway": "TCAD", "manor": "TCAD", "bee cave": "TCAD", "travis": "TCAD",
-            # Tarrant County (TAD)
-            "fort worth": "TAD", "arlington": "TAD", "euless": "TAD", "bedford": "TAD", "hurst": "TAD", "haltom city": "TAD", "keller": "TAD", "southlake": "TAD", "grapevine": "TAD", "colleyville": "TAD", "tarrant": "TAD",
-            # Collin County (CCAD)
-            "plano": "CCAD", "frisco": "CCAD", "mckinney": "CCAD", "allen": "CCAD", "wylie": "CCAD", "prosper": "CCAD", "celina": "CCAD", "melissa": "CCAD", "collin": "CCAD",
-            # Harris County (HCAD)
-            "houston": "HCAD", "katy": "HCAD", "cypress": "HCAD", "spring": "HCAD", "tomball": "HCAD", "humble": "HCAD", "bellaire": "HCAD", "pasadena": "HCAD", "baytown": "HCAD", "deer park": "HCAD", "la porte": "HCAD", "harris": "HCAD",
-            # Brazoria County (BCAD)
-            "brazoria": "BCAD", "pearland": "BCAD", "angleton": "BCAD", "alvin": "BCAD", "manvel": "BCAD", "freeport": "BCAD", "lake jackson": "BCAD"
-        }
-        for city, dist in city_map.items():
-            if city in lower:
-                target = dist
-                break
+        from backend.utils.address_utils import district_from_address
+        target = district_from_address(raw_acc)
 
     # 3. ZIP code fallback
     if not target:
@@ -737,8 +720,8 @@ class AppState(rx.State):
         if not self.report_account:
             return
         try:
-            from backend.db.supabase_client import supabase_service
-            prop = await supabase_service.get_property_by_account(self.report_account)
+            from backend.db.supabase_client import supabase_service, PROPERTY_CORE_COLS
+            prop = await supabase_service.get_property_by_account(self.report_account, fields=PROPERTY_CORE_COLS)
             protest = await supabase_service.get_latest_protest(self.report_account)
             self.report_property = prop or {}
             self.report_protest = protest or {}